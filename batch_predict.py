@@ -0,0 +1,110 @@
+"""
+Score a student CSV, Parquet or Arrow file without the Streamlit UI
+
+Usage:
+    python batch_predict.py students.csv predictions.csv [--chunk-size 50000]
+    python batch_predict.py roster.parquet predictions.parquet --workers 4 --models both
+    python batch_predict.py roster.csv predictions.out --format parquet --models lr
+
+At the end it prints rows/sec, the time spent in each stage and the peak
+resident memory, so it can run from cron and leave a useful log behind.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_and_others'))
+from prediction_functions import batch_component_names, load_all_models, predict_batch_file
+
+# Stages in pipeline order, as recorded by predict_batch_file
+STAGES = ['load_models', 'read', 'clean', 'preprocess', 'scale', 'lr', 'svm', 'assemble', 'write']
+
+def peak_rss_mb():
+    """
+    Peak resident memory of this process and of its largest child, in MB
+
+    Uses resource.getrusage where available (Linux, macOS) and psutil's
+    current process memory otherwise; values are None when neither works.
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None, None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 2**20, None
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    unit = 1 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return own / 2**20, (children / 2**20 if children else None)
+
+def print_report(n_rows, elapsed, timings, n_workers):
+    print(f"✅ Scored {n_rows} students in {elapsed:.1f}s ({n_rows / elapsed if elapsed else 0:,.0f} rows/sec)")
+
+    print("\nStage timings" + (f" (scoring stages summed over {n_workers} workers)" if n_workers > 1 else "") + ":")
+    for stage in STAGES + sorted(set(timings) - set(STAGES)):
+        if stage in timings:
+            share = timings[stage] / elapsed if elapsed else 0
+            print(f"  {stage:<12} {timings[stage]:8.2f}s {share:7.1%}")
+
+    own, children = peak_rss_mb()
+    if own is None:
+        print("\nPeak RSS: unavailable on this platform")
+    else:
+        print(f"\nPeak RSS: {own:.0f} MB" + (f" (largest worker {children:.0f} MB)" if children and n_workers > 1 else ""))
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch academic performance predictions")
+    parser.add_argument('input', help="CSV, Parquet or Arrow file with student features")
+    parser.add_argument('output', help="CSV, Parquet or Arrow file to write predictions to")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'arrow'],
+                        help="Output format (defaults to the output file extension)")
+    parser.add_argument('--input-format', choices=['csv', 'parquet', 'arrow'],
+                        help="Input format (defaults to the input file extension)")
+    parser.add_argument('--chunk-size', type=int, default=50000, help="Rows scored per chunk")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes used for scoring")
+    parser.add_argument('--models', default='both', choices=['lr', 'svm', 'both'],
+                        help="Models to score with: Logistic Regression, SVM or both")
+    parser.add_argument('--svm-mode', default='single_pass', choices=['sklearn', 'single_pass', 'approximate'],
+                        help="How the SVM is scored")
+    parser.add_argument('--dedupe', action='store_true', help="Score identical student rows only once")
+    parser.add_argument('--keep-columns', nargs='+', default=[], metavar='COLUMN',
+                        help="Extra input columns (e.g. a student ID) to copy into the output")
+    parser.add_argument('--bundle', help="Load the models from this model bundle instead of the pickles")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    timings = {}
+
+    # Lazy, so a multi-worker run only loads feature_info here
+    components = load_all_models(lazy=args.bundle is None, bundle_path=args.bundle)
+    if components is None:
+        print("❌ Failed to load models.")
+        return 1
+    # Only what the selected models need, so an LR-only run never unpickles the SVM
+    if args.workers <= 1 and hasattr(components, 'preload'):
+        components.preload(names=batch_component_names(args.models, args.svm_mode))
+    timings['load_models'] = time.perf_counter() - start
+
+    try:
+        n_rows = predict_batch_file(args.input, args.output, components, chunk_size=args.chunk_size,
+                                    keep_columns=args.keep_columns, input_format=args.input_format,
+                                    output_format=args.format, n_workers=args.workers,
+                                    bundle_path=args.bundle, timings=timings, models=args.models,
+                                    svm_mode=args.svm_mode, dedupe=args.dedupe)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    print(f"Predictions written to {args.output}")
+    print_report(n_rows, elapsed, timings, args.workers)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
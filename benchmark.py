@@ -0,0 +1,229 @@
+"""
+Benchmark suite for the prediction paths
+
+Usage:
+    python benchmark.py run [--sizes 1 100 10000 1000000] [--output results.json] [--baseline baseline.json]
+    python benchmark.py compare results.json baseline.json [--threshold 0.10]
+
+run times load_all_models (eager, and lazy up to the first prediction),
+preprocess_input_data, predict_single_student and
+predict_batch_students on seeded synthetic students at each size. Each case
+gets a warm-up call and then timed repeats (at least --min-repeats, up to
+--repeats or --max-seconds); peak memory comes from one extra run under
+tracemalloc, so tracing never skews the timings. Results are written as JSON
+together with the library versions and the model fingerprint.
+
+compare (or run --baseline) flags every case whose median latency or peak
+memory grew by more than the threshold (memory also by at least
+MIN_MEMORY_GROWTH_MB), and exits non-zero if any did.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_and_others'))
+from prediction_functions import (
+    load_all_models,
+    predict_batch_students,
+    predict_single_student,
+    preprocess_input_data
+)
+from synthetic_students import generate_students
+
+DEFAULT_SIZES = [1, 100, 10000, 1000000]
+
+# Allowed slowdown (or memory growth) against the baseline before a case counts as a regression
+REGRESSION_THRESHOLD = 0.10
+
+# Memory growth below this is allocator noise, whatever the ratio
+MIN_MEMORY_GROWTH_MB = 1.0
+
+def measure(func, n_rows, repeats=20, min_repeats=3, max_seconds=10.0):
+    """
+    Time func() after one warm-up call and measure its peak traced memory
+
+    Returns:
+        Dictionary with the latency distribution in milliseconds, rows/sec
+        at the median (None when n_rows is None) and the tracemalloc peak in MB
+    """
+    func()
+
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < repeats:
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+        if len(latencies) >= min_repeats and time.perf_counter() - started > max_seconds:
+            break
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    p50 = float(np.percentile(latencies_ms, 50))
+    return {
+        'rows': n_rows,
+        'runs': len(latencies),
+        'min_ms': float(latencies_ms.min()),
+        'p50_ms': p50,
+        'p90_ms': float(np.percentile(latencies_ms, 90)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'max_ms': float(latencies_ms.max()),
+        'mean_ms': float(latencies_ms.mean()),
+        'rows_per_second': n_rows / (p50 / 1000) if n_rows and p50 else None,
+        'peak_memory_mb': peak / 2**20
+    }
+
+def run_benchmarks(sizes, svm_mode='single_pass', seed=0, repeats=20, min_repeats=3, max_seconds=10.0,
+                   bundle_path=None, log=print):
+    """
+    Run every benchmark case
+
+    Returns:
+        Dictionary with the environment, the configuration and one result per case
+    """
+    import pandas as pd
+    import sklearn
+
+    timing = dict(repeats=repeats, min_repeats=min_repeats, max_seconds=max_seconds)
+    results = {}
+
+    def case(name, func, n_rows):
+        results[name] = measure(func, n_rows, **timing)
+        r = results[name]
+        log(f"  {name:<44} p50 {r['p50_ms']:10.3f} ms  p99 {r['p99_ms']:10.3f} ms  "
+            f"{r['rows_per_second'] or 0:>14,.0f} rows/s  {r['peak_memory_mb']:8.1f} MB")
+
+    log("Loading models...")
+    components = load_all_models(bundle_path=bundle_path)
+    if components is None:
+        raise RuntimeError("Failed to load models")
+
+    case('load_all_models', lambda: load_all_models(bundle_path=bundle_path), None)
+    student = generate_students(1, seed, decimals=1).iloc[0].to_dict()
+    student = {key: value.item() if hasattr(value, 'item') else value for key, value in student.items()}
+
+    # Building the lazy container is free; what it defers is paid by the first prediction
+    case('load_all_models[lazy]+first_prediction',
+         lambda: predict_single_student(student, load_all_models(lazy=True, bundle_path=bundle_path),
+                                        use_linear_engine=True, svm_mode=svm_mode), None)
+    case('predict_single_student', lambda: predict_single_student(student, components), 1)
+    case('predict_single_student[engine]',
+         lambda: predict_single_student(student, components, use_linear_engine=True, svm_mode=svm_mode), 1)
+
+    for n_rows in sizes:
+        log(f"Generating {n_rows:,} students...")
+        df = generate_students(n_rows, seed, decimals=1)
+        case(f'preprocess_input_data@{n_rows}',
+             lambda: preprocess_input_data(df, components['feature_encoders'], components['feature_info'],
+                                           components.get('encoding_tables')), n_rows)
+        case(f'predict_batch_students@{n_rows}',
+             lambda: predict_batch_students(df, components, svm_mode=svm_mode), n_rows)
+        del df
+
+    return {
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'scikit-learn': sklearn.__version__
+        },
+        'config': {'sizes': sizes, 'svm_mode': svm_mode, 'seed': seed, 'bundle_path': bundle_path, **timing},
+        'model_fingerprint': components.get('model_fingerprint'),
+        'results': results
+    }
+
+def compare_results(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare two result files case by case
+
+    Returns:
+        List of (case, metric, baseline value, current value, ratio, regressed)
+        for every case present in both
+    """
+    rows = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        for metric in ('p50_ms', 'peak_memory_mb'):
+            before, after = baseline['results'][name][metric], result[metric]
+            ratio = after / before if before else float('inf') if after else 1.0
+            regressed = ratio > 1 + threshold
+            if metric == 'peak_memory_mb':
+                regressed = regressed and after - before >= MIN_MEMORY_GROWTH_MB
+            rows.append((name, metric, before, after, ratio, regressed))
+    return rows
+
+def print_comparison(rows, threshold, baseline_path):
+    print(f"\nCompared with {baseline_path} (threshold +{threshold:.0%}):")
+    print(f"  {'case':<44} {'metric':<15} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, metric, before, after, ratio, regressed in rows:
+        flag = '❌' if regressed else '  '
+        print(f"{flag}{name:<44} {metric:<15} {before:12.3f} {after:12.3f} {ratio - 1:+8.1%}")
+
+    regressions = [row for row in rows if row[5]]
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) over the {threshold:.0%} threshold")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the prediction paths")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help="Run the benchmarks")
+    run.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Batch sizes in rows")
+    run.add_argument('--svm-mode', default='single_pass', choices=['sklearn', 'single_pass', 'approximate'])
+    run.add_argument('--seed', type=int, default=0, help="Seed for the synthetic students")
+    run.add_argument('--repeats', type=int, default=20, help="Timed runs per case")
+    run.add_argument('--min-repeats', type=int, default=3, help="Timed runs per case even past --max-seconds")
+    run.add_argument('--max-seconds', type=float, default=10.0, help="Time budget per case")
+    run.add_argument('--bundle', help="Benchmark with the models loaded from this model bundle")
+    run.add_argument('--output', default='benchmark_results.json', help="JSON file for the results")
+    run.add_argument('--baseline', help="Results JSON to compare against")
+    run.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help="Allowed relative regression")
+
+    compare = subparsers.add_parser('compare', help="Compare two results files")
+    compare.add_argument('current')
+    compare.add_argument('baseline')
+    compare.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help="Allowed relative regression")
+
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        with open(args.current) as f:
+            current = json.load(f)
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return print_comparison(compare_results(current, baseline, args.threshold), args.threshold, args.baseline)
+
+    report = run_benchmarks(args.sizes, args.svm_mode, args.seed, args.repeats, args.min_repeats,
+                            args.max_seconds, args.bundle)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return print_comparison(compare_results(report, baseline, args.threshold), args.threshold, args.baseline)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
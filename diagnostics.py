@@ -0,0 +1,136 @@
+"""
+Startup diagnostics for the Streamlit app
+
+Usage:
+    python diagnostics.py importtime [module ...] [--top 20]
+    python diagnostics.py first-paint [--budget 1.0] [--runs 3]
+
+importtime runs `python -X importtime` in a fresh interpreter and prints the
+slowest imports by cumulative time. first-paint runs streamlit_app.py headless
+(streamlit.testing AppTest) in fresh interpreters, reports the time until the
+Home page has rendered and exits non-zero when it is over budget.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# What a fresh session imports before the Home page, and what the prediction pages add
+DEFAULT_MODULES = ['streamlit', 'prediction_functions', 'model_registry', 'prediction_cache']
+
+# Time-to-first-paint budget in seconds (import streamlit + first script run)
+FIRST_PAINT_BUDGET = 1.0
+
+FIRST_PAINT_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import streamlit
+imported = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file('streamlit_app.py', default_timeout=60)
+harness = time.perf_counter()
+app.run()
+done = time.perf_counter()
+print(json.dumps({
+    'import_streamlit': imported - start,
+    'first_run': done - harness,
+    'errors': [str(e.value) for e in app.exception]
+}))
+"""
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output into (module, self_us, cumulative_us, depth) rows
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+def import_time_report(modules, top=20):
+    """
+    Import the modules in a fresh interpreter and summarize where the time goes
+
+    Returns:
+        Dictionary with per-module cumulative times and the slowest imports
+    """
+    code = '; '.join(f'import {module}' for module in modules)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=os.path.join(APP_DIR, 'model_and_others'),
+                          capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=APP_DIR))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    rows = parse_importtime(proc.stderr)
+    top_level = {name: cumulative for name, _, cumulative, depth in rows if name in modules}
+    slowest = sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+    return {
+        'total_seconds': sum(top_level.values()) / 1e6,
+        'modules': {name: top_level.get(name, 0) / 1e6 for name in modules},
+        'slowest': [{'module': name, 'self_seconds': self_us / 1e6, 'cumulative_seconds': cumulative_us / 1e6}
+                    for name, self_us, cumulative_us, _ in slowest]
+    }
+
+def measure_first_paint():
+    """
+    Render the Home page once in a fresh interpreter
+
+    Returns:
+        Dictionary with streamlit import time, first run time and any app errors
+    """
+    proc = subprocess.run([sys.executable, '-c', FIRST_PAINT_SCRIPT], cwd=APP_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result['total'] = result['import_streamlit'] + result['first_run']
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup diagnostics for the Streamlit app")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    importtime = subparsers.add_parser('importtime', help="Import-time breakdown")
+    importtime.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    importtime.add_argument('--top', type=int, default=20, help="Number of slowest imports to list")
+
+    first_paint = subparsers.add_parser('first-paint', help="Time-to-first-paint of the Home page")
+    first_paint.add_argument('--budget', type=float, default=FIRST_PAINT_BUDGET, help="Budget in seconds")
+    first_paint.add_argument('--runs', type=int, default=3, help="Fresh sessions to measure")
+
+    args = parser.parse_args()
+
+    if args.command == 'importtime':
+        report = import_time_report(args.modules, args.top)
+        print("Cumulative import time per module:")
+        for name, seconds in report['modules'].items():
+            print(f"  {name:<40} {seconds * 1000:8.1f} ms")
+        print(f"\nSlowest {len(report['slowest'])} imports:")
+        print(f"  {'module':<40} {'self':>10} {'cumulative':>12}")
+        for row in report['slowest']:
+            print(f"  {row['module']:<40} {row['self_seconds'] * 1000:8.1f} ms {row['cumulative_seconds'] * 1000:9.1f} ms")
+        return 0
+
+    runs = [measure_first_paint() for _ in range(args.runs)]
+    for i, run in enumerate(runs, 1):
+        print(f"Run {i}: import streamlit {run['import_streamlit']:.2f}s + first run {run['first_run']:.2f}s "
+              f"= {run['total']:.2f}s")
+        for error in run['errors']:
+            print(f"  ❌ App error: {error}")
+
+    best = min(run['total'] for run in runs)
+    if any(run['errors'] for run in runs):
+        return 1
+    if best > args.budget:
+        print(f"❌ Time-to-first-paint {best:.2f}s is over the {args.budget:.2f}s budget")
+        return 1
+    print(f"✅ Time-to-first-paint {best:.2f}s is within the {args.budget:.2f}s budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 """
 Quick fix script to create compatible models with current environment
 """
-import pandas as pd
+import argparse
+import sys
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
@@ -11,57 +12,18 @@ import joblib
 import json
 from datetime import datetime
 
+sys.path.append('model_and_others')
+from synthetic_students import generate_students
+
 print("Creating compatible models for your environment...")
 
-# Create sample data that matches your dataset structure
-np.random.seed(42)
-n_samples = 200
-
-# Generate synthetic data based on your feature descriptions
-data = {
-    'age': np.random.randint(17, 25, n_samples),
-    'gender': np.random.choice(['Male', 'Female'], n_samples),
-    'study_hours_per_day': np.random.uniform(0, 8.3, n_samples),
-    'social_media_hours': np.random.uniform(0, 7.2, n_samples),
-    'netflix_hours': np.random.uniform(0, 5.4, n_samples),
-    'part_time_job': np.random.choice(['No', 'Yes'], n_samples),
-    'attendance_percentage': np.random.uniform(56, 100, n_samples),
-    'sleep_hours': np.random.uniform(3.2, 10.0, n_samples),
-    'diet_quality': np.random.choice(['Poor', 'Fair', 'Good'], n_samples),
-    'exercise_frequency': np.random.randint(0, 7, n_samples),
-    'parental_education_level': np.random.choice(['High School', 'Bachelor', 'Master'], n_samples),
-    'internet_quality': np.random.choice(['Poor', 'Average', 'Good'], n_samples),
-    'mental_health_rating': np.random.randint(1, 11, n_samples),
-    'extracurricular_participation': np.random.choice(['No', 'Yes'], n_samples)
-}
+parser = argparse.ArgumentParser(description="Retrain the models on synthetic students")
+parser.add_argument('--n-samples', type=int, default=200, help="Number of synthetic students to train on")
+args = parser.parse_args()
 
-# Create synthetic exam scores based on logical relationships
-exam_scores = []
-for i in range(n_samples):
-    base_score = 70
-    # Study hours positive impact
-    base_score += data['study_hours_per_day'][i] * 3
-    # Social media negative impact  
-    base_score -= data['social_media_hours'][i] * 2
-    # Attendance positive impact
-    base_score += (data['attendance_percentage'][i] - 70) * 0.3
-    # Mental health positive impact
-    base_score += data['mental_health_rating'][i] * 1.5
-    # Add some randomness
-    base_score += np.random.normal(0, 10)
-    # Clamp between 18.4 and 100
-    exam_scores.append(max(18.4, min(100.0, base_score)))
-
-data['exam_score'] = exam_scores
-
-# Convert to DataFrame
-df = pd.DataFrame(data)
-
-# Create performance categories
-df['performance_category'] = pd.cut(df['exam_score'], 
-                                  bins=[0, 60, 80, 100], 
-                                  labels=['Poor', 'Average', 'Good'],
-                                  include_lowest=True)
+# Generate synthetic data based on your feature descriptions, with exam scores
+# and performance categories from the same logical relationships
+df = generate_students(args.n_samples, random_state=42, with_target=True)
 
 print("Sample data created successfully!")
 
@@ -187,14 +149,22 @@ print("✅ Compatible with your current environment!")
 # Test loading
 print("Testing model loading...")
 try:
-    import sys
-    sys.path.append('model_and_others')
-    from prediction_functions import load_all_models
+    from prediction_functions import load_all_models, verify_linear_engine
+    from model_bundle import export_model_bundle
     
     components = load_all_models()
     if components:
         print("✅ Model loading test PASSED!")
         print(f"Loaded components: {list(components.keys())}")
+        
+        is_equivalent, max_diff = verify_linear_engine(components, df[feature_columns])
+        if is_equivalent:
+            print(f"✅ Linear engine equivalence test PASSED! (max diff {max_diff:.2e})")
+        else:
+            print(f"❌ Linear engine equivalence test FAILED! (max diff {max_diff:.2e})")
+        
+        bundle_path = export_model_bundle(components)
+        print(f"✅ Model bundle exported to {bundle_path}")
     else:
         print("❌ Model loading test FAILED!")
 except Exception as e:
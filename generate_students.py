@@ -0,0 +1,47 @@
+"""
+Generate seeded synthetic student files for fixtures, load tests and training experiments
+
+Usage:
+    python generate_students.py students.parquet --rows 10000000
+    python generate_students.py students.csv --rows 50000 --seed 7 --with-target
+
+Rows are generated and written in chunks of --chunk-size, so memory use
+stays flat whatever --rows is. Values follow the ranges in
+model_and_others/feature_descriptions.json; see synthetic_students.py.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_and_others'))
+from synthetic_students import write_students
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic student files")
+    parser.add_argument('output', help="CSV, Parquet or Arrow file to write")
+    parser.add_argument('--rows', type=int, default=100000, help="Number of students")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    parser.add_argument('--chunk-size', type=int, default=1000000, help="Rows generated and written at a time")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'arrow'],
+                        help="Output format (defaults to the output file extension)")
+    parser.add_argument('--decimals', type=int, default=1, help="Decimals kept for the float features")
+    parser.add_argument('--with-target', action='store_true',
+                        help="Add the exam_score and performance_category columns")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        n_rows = write_students(args.output, args.rows, chunk_size=args.chunk_size, random_state=args.seed,
+                                file_format=args.format, with_target=args.with_target,
+                                categorical=True, decimals=args.decimals)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Wrote {n_rows} students to {args.output} in {elapsed:.1f}s ({n_rows / elapsed if elapsed else 0:,.0f} rows/sec)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Asyncio micro-batching in front of the prediction functions
+
+Under concurrent load single-student requests arrive within milliseconds of
+each other. MicroBatcher queues them, takes up to max_batch_size requests or
+whatever arrived within max_wait seconds of the first one, scores the whole
+batch with one vectorized predict_students call and resolves each caller's
+future with its own result. While a batch is being scored new requests keep
+queueing, so batches grow with load: throughput approaches batch speed and
+the added latency is bounded by max_wait plus one batch.
+
+Usage from asyncio code:
+
+    async with MicroBatcher(components) as batcher:
+        result = await batcher.predict(student)
+
+and from threads (e.g. an HTTP server), with the batcher's own event loop:
+
+    batcher = MicroBatcher(components).start_in_thread()
+    result = batcher.submit(student).result()
+"""
+import asyncio
+import threading
+import time
+
+from prediction_functions import predict_students
+
+class MicroBatcher:
+    """
+    Collects single-student requests into batches for predict_students
+
+    Args:
+        components: Dictionary with loaded models and preprocessors
+        max_batch_size: Largest batch scored in one call
+        max_wait: Seconds to wait for more requests after the first one
+        **predict_kwargs: Passed through to predict_students
+    """
+
+    def __init__(self, components, max_batch_size=64, max_wait=0.005, **predict_kwargs):
+        self.components = components
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.predict_kwargs = predict_kwargs
+
+        self.loop = None
+        self._queue = None
+        self._task = None
+        self._getter = None
+        self._thread = None
+
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+        self.scoring_seconds = 0.0
+
+    async def start(self):
+        """
+        Start the dispatcher task on the running event loop
+        """
+        if self._task is None:
+            self.loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue()
+            self._task = self.loop.create_task(self._dispatch())
+        return self
+
+    async def close(self):
+        """
+        Stop the dispatcher; requests still queued get a RuntimeError
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        pending = []
+        if self._getter is not None:
+            if self._getter.done() and not self._getter.cancelled():
+                pending.append(self._getter.result())
+            self._getter.cancel()
+            self._getter = None
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher closed"))
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def predict(self, student_data):
+        """
+        Score one student as part of the next batch
+
+        Returns:
+            The result dictionary predict_single_student would return
+        """
+        if self._task is None:
+            raise RuntimeError("MicroBatcher is not started")
+        future = self.loop.create_future()
+        await self._queue.put((student_data, future))
+        return await future
+
+    async def _next_request(self, timeout=None):
+        """
+        Next queued request, or None after timeout seconds
+
+        The pending get is kept for the next call rather than cancelled, so a
+        request that arrives just as the timeout expires is never dropped.
+        """
+        if self._getter is None:
+            self._getter = self.loop.create_task(self._queue.get())
+        done, _ = await asyncio.wait({self._getter}, timeout=timeout)
+        if not done:
+            return None
+        request = self._getter.result()
+        self._getter = None
+        return request
+
+    async def _collect_batch(self):
+        """
+        Wait for one request, then take more until the batch is full or the deadline passes
+        """
+        batch = [await self._next_request()]
+        deadline = self.loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Requests that are already queued don't have to wait for the deadline
+            if self._getter is None and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                break
+            request = await self._next_request(remaining)
+            if request is None:
+                break
+            batch.append(request)
+        return batch
+
+    async def _dispatch(self):
+        while True:
+            batch = await self._collect_batch()
+            # Callers that gave up don't need scoring
+            batch = [(student, future) for student, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            students = [student for student, _ in batch]
+            try:
+                # Off the event loop, so new requests keep queueing while this batch scores
+                results = await self.loop.run_in_executor(None, self._score, students)
+            except Exception:
+                # One bad request must not fail the whole batch: score one by one to isolate it
+                results = [await self.loop.run_in_executor(None, self._score_one, student) for student in students]
+            self.scoring_seconds += time.perf_counter() - start
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _score(self, students):
+        return predict_students(students, self.components, **self.predict_kwargs)
+
+    def _score_one(self, student):
+        try:
+            return self._score([student])[0]
+        except Exception as e:
+            return e
+
+    def start_in_thread(self):
+        """
+        Run the dispatcher on its own event loop in a daemon thread
+
+        Returns:
+            self, ready for submit()
+        """
+        started = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='micro-batcher', daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def submit(self, student_data):
+        """
+        Thread-safe predict(): queue a student from any thread
+
+        Returns:
+            concurrent.futures.Future with the result dictionary
+        """
+        return asyncio.run_coroutine_threadsafe(self.predict(student_data), self.loop)
+
+    def stats(self):
+        """
+        Requests, batches, mean and largest batch size and scoring time so far
+        """
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'scoring_seconds': self.scoring_seconds
+        }
@@ -0,0 +1,227 @@
+"""
+Single-file, memory-mappable model bundle
+
+The six pickles and model_metadata.json can be exported into one versioned
+bundle file:
+
+    magic (8 bytes) | manifest length (uint64, little endian) | manifest (JSON)
+    | padding | arrays, each aligned to ARRAY_ALIGNMENT bytes
+
+The manifest holds the small, non-numeric parts (feature info, encoder
+classes, metadata, SVM and LR settings) plus the dtype, shape and offset of
+every array. Loading memory-maps the file read-only and wraps each array as
+a view, so load time is near zero, worker processes on one host share the
+same page-cache pages, and no pickle is ever executed.
+
+The SVM is restored as the compiled single-pass engine; the scaler, the
+Logistic Regression and the label encoders are rebuilt as sklearn objects
+around the mapped arrays so the DataFrame prediction path keeps working.
+"""
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+BUNDLE_MAGIC = b'APMBNDL\x00'
+BUNDLE_FORMAT_VERSION = 1
+ARRAY_ALIGNMENT = 64
+
+# Default bundle location next to the pickles
+DEFAULT_BUNDLE_FILE = 'model_bundle.bin'
+
+def _align(offset):
+    return (offset + ARRAY_ALIGNMENT - 1) // ARRAY_ALIGNMENT * ARRAY_ALIGNMENT
+
+def export_model_bundle(components, path=None):
+    """
+    Write the loaded components into a single bundle file
+
+    Args:
+        components: Dictionary with loaded models and preprocessors
+        path: Output file (defaults to model_bundle.bin next to the pickles)
+
+    Returns:
+        Path of the written bundle
+    """
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), DEFAULT_BUNDLE_FILE)
+
+    lr_model = components['lr_model']
+    scaler = components['scaler']
+    linear = components['linear_engine']
+    svm = components['svm_engine']
+
+    arrays = {
+        'lr_coef': lr_model.coef_,
+        'lr_intercept': lr_model.intercept_,
+        'scaler_mean': scaler.mean_,
+        'scaler_scale': scaler.scale_,
+        'scaler_var': scaler.var_,
+        'linear_weights': linear['weights'],
+        'linear_bias': linear['bias'],
+        'svm_support_vectors': svm['support_vectors'],
+        'svm_pair_weights': svm['pair_weights'],
+        'svm_intercept': svm['intercept'],
+        'svm_pairs': svm['pairs'],
+        'svm_prob_a': svm['prob_a'],
+        'svm_prob_b': svm['prob_b'],
+        'svm_classes': svm['classes']
+    }
+    for dtype, kernel in svm['kernel_arrays'].items():
+        suffix = np.dtype(dtype).name
+        for key, value in kernel.items():
+            arrays[f'svm_{key}_{suffix}'] = value
+
+    # Lay the arrays out back to back, each one aligned
+    layout = {}
+    offset = 0
+    for name, value in arrays.items():
+        value = np.ascontiguousarray(value)
+        arrays[name] = value
+        offset = _align(offset)
+        layout[name] = {'dtype': value.dtype.str, 'shape': list(value.shape), 'offset': offset}
+        offset += value.nbytes
+
+    metadata = components['metadata']
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'model_version': metadata.get('project_info', {}).get('version'),
+        'model_fingerprint': components.get('model_fingerprint'),
+        'created_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'feature_info': components['feature_info'],
+        'encoder_classes': {col: [str(c) for c in enc.classes_] for col, enc in components['feature_encoders'].items()},
+        'target_classes': [str(c) for c in components['target_encoder'].classes_],
+        'lr': {
+            'solver': lr_model.solver,
+            # Older scikit-learn versions pick softmax or one-vs-rest in predict_proba from this
+            'multi_class': getattr(lr_model, 'multi_class', 'auto'),
+            'multinomial': bool(linear['multinomial'])
+        },
+        'svm': {'gamma': svm['gamma']},
+        'metadata': metadata,
+        'arrays': layout
+    }
+    manifest_bytes = json.dumps(manifest).encode('utf-8')
+    data_start = _align(len(BUNDLE_MAGIC) + 8 + len(manifest_bytes))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(np.uint64(len(manifest_bytes)).tobytes())
+        f.write(manifest_bytes)
+        for name, value in arrays.items():
+            f.seek(data_start + layout[name]['offset'])
+            f.write(value.tobytes())
+    # Readers never see a half-written bundle
+    os.replace(tmp_path, path)
+
+    return path
+
+def read_bundle_manifest(path):
+    """
+    Read only the manifest of a bundle (cheap, no arrays are mapped)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not a model bundle")
+        manifest_length = int(np.frombuffer(f.read(8), dtype='<u8')[0])
+        manifest = json.loads(f.read(manifest_length).decode('utf-8'))
+
+    if manifest['format_version'] != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format version {manifest['format_version']}")
+    manifest['data_start'] = _align(len(BUNDLE_MAGIC) + 8 + manifest_length)
+    return manifest
+
+def load_model_bundle(path=None):
+    """
+    Memory-map a bundle and build a components dictionary around it
+
+    Args:
+        path: Bundle file (defaults to model_bundle.bin next to the pickles)
+
+    Returns:
+        Dictionary with the same keys load_all_models provides, except that
+        the SVM is only available as 'svm_engine'
+    """
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+    from prediction_functions import compile_contribution_tables, compile_encoding_tables
+
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), DEFAULT_BUNDLE_FILE)
+
+    manifest = read_bundle_manifest(path)
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')
+
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        arrays[name] = np.ndarray(tuple(spec['shape']), dtype=np.dtype(spec['dtype']),
+                                  buffer=mapped, offset=manifest['data_start'] + spec['offset'])
+
+    feature_info = manifest['feature_info']
+    feature_columns = feature_info['feature_columns']
+
+    def label_encoder(classes):
+        encoder = LabelEncoder()
+        encoder.classes_ = np.asarray(classes, dtype=object)
+        return encoder
+
+    scaler = StandardScaler()
+    scaler.mean_ = arrays['scaler_mean']
+    scaler.scale_ = arrays['scaler_scale']
+    scaler.var_ = arrays['scaler_var']
+    scaler.n_features_in_ = len(feature_columns)
+    scaler.feature_names_in_ = np.asarray(feature_columns, dtype=object)
+    scaler.n_samples_seen_ = 0
+
+    lr_model = LogisticRegression(solver=manifest['lr']['solver'])
+    # Set as an attribute: newer scikit-learn no longer takes it as a parameter.
+    # Bundles written before it was stored fall back to what the engine uses
+    lr_model.multi_class = manifest['lr'].get('multi_class', 'auto' if manifest['lr']['multinomial'] else 'ovr')
+    lr_model.coef_ = arrays['lr_coef']
+    lr_model.intercept_ = arrays['lr_intercept']
+    lr_model.classes_ = np.arange(len(manifest['target_classes']))
+    lr_model.n_features_in_ = len(feature_columns)
+
+    kernel_arrays = {}
+    for dtype in (np.float64, np.float32):
+        suffix = np.dtype(dtype).name
+        kernel_arrays[dtype] = {
+            key: arrays[f'svm_{key}_{suffix}'] for key in ('support_vectors_t', 'sv_sq_norms', 'pair_weights')
+        }
+
+    components = {
+        'lr_model': lr_model,
+        'scaler': scaler,
+        'target_encoder': label_encoder(manifest['target_classes']),
+        'feature_encoders': {col: label_encoder(classes) for col, classes in manifest['encoder_classes'].items()},
+        'feature_info': feature_info,
+        'metadata': manifest['metadata'],
+        'model_fingerprint': manifest['model_fingerprint'],
+        'linear_engine': {
+            'weights': arrays['linear_weights'],
+            'bias': arrays['linear_bias'],
+            'mean': arrays['scaler_mean'],
+            'scale': arrays['scaler_scale'],
+            'multinomial': manifest['lr']['multinomial']
+        },
+        'svm_engine': {
+            'classes': arrays['svm_classes'],
+            'support_vectors': arrays['svm_support_vectors'],
+            'pair_weights': arrays['svm_pair_weights'],
+            'kernel_arrays': kernel_arrays,
+            'intercept': arrays['svm_intercept'],
+            'pairs': arrays['svm_pairs'],
+            'prob_a': arrays['svm_prob_a'],
+            'prob_b': arrays['svm_prob_b'],
+            'gamma': manifest['svm']['gamma']
+        },
+        'bundle_manifest': {key: value for key, value in manifest.items() if key != 'arrays'}
+    }
+
+    components['encoding_tables'] = compile_encoding_tables(components['feature_encoders'], feature_info)
+    components['contribution_tables'] = compile_contribution_tables(
+        lr_model, scaler, components['encoding_tables'], feature_info, components['target_encoder'].classes_)
+
+    return components
@@ -0,0 +1,246 @@
+"""
+Hot reload of model artifacts without restarting the app
+
+ModelRegistry owns the active components and a watcher thread that polls
+model_and_others (or a model bundle's manifest) for a new model version.
+When the artifacts change it loads them in the background, validates them
+with a smoke prediction and only then swaps them in. The swap is a single
+reference assignment: requests that already called current() keep using the
+version they started with, new requests get the new one. A version that
+fails to load or validate is skipped until the artifacts change again.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from prediction_functions import (
+    MODEL_ARTIFACT_FILES,
+    load_all_models,
+    model_fingerprint,
+    predict_single_student
+)
+
+# Student used for the smoke prediction before a new version goes live
+SMOKE_TEST_STUDENT = {
+    'age': 20,
+    'gender': 'Male',
+    'study_hours_per_day': 5.5,
+    'social_media_hours': 1.5,
+    'netflix_hours': 1.0,
+    'part_time_job': 'No',
+    'attendance_percentage': 95.0,
+    'sleep_hours': 7.5,
+    'diet_quality': 'Good',
+    'exercise_frequency': 4,
+    'parental_education_level': 'Master',
+    'internet_quality': 'Good',
+    'mental_health_rating': 8,
+    'extracurricular_participation': 'Yes'
+}
+
+def validate_components(components):
+    """
+    Smoke-test a set of components before it serves traffic
+
+    Raises:
+        ValueError: If the prediction fails or looks malformed
+    """
+    classes = set(str(c) for c in components['target_encoder'].classes_)
+    for kwargs in ({}, {'use_linear_engine': True, 'svm_mode': 'single_pass'}):
+        result = predict_single_student(SMOKE_TEST_STUDENT, components, **kwargs)
+        for key in ('primary_prediction', 'secondary_prediction'):
+            prediction = result[key]
+            probabilities = np.array(list(prediction['probabilities'].values()))
+            if str(prediction['prediction']) not in classes:
+                raise ValueError(f"{prediction['model']} predicted unknown class {prediction['prediction']!r}")
+            if not np.all(np.isfinite(probabilities)) or abs(probabilities.sum() - 1.0) > 1e-6:
+                raise ValueError(f"{prediction['model']} returned invalid probabilities {probabilities}")
+
+class ModelRegistry:
+    """
+    Serves the current model version and reloads it when the artifacts change
+
+    Args:
+        model_dir: Directory with the artifact files (defaults to model_and_others)
+        bundle_path: Watch and load this model bundle instead of the pickles
+        poll_interval: Seconds between checks for new artifacts
+        settle_time: Seconds the files must stay unchanged before loading, so
+            a retrain that is still writing pickles is not picked up half-way
+        lazy: Start serving the first version while its pickles load in the
+            background (see LazyComponents); new versions are always fully
+            loaded before they are swapped in, so a version never mixes
+            artifacts from two retrains
+    """
+
+    def __init__(self, model_dir=None, bundle_path=None, poll_interval=5.0, settle_time=1.0, lazy=False):
+        self.model_dir = model_dir or os.path.dirname(os.path.abspath(__file__))
+        self.bundle_path = bundle_path
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.lazy = lazy
+
+        self._active = None
+        self._version = None
+        self._rejected_version = None
+        self._signature = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.reload_count = 0
+        self.last_error = None
+        self.loaded_at = None
+
+        self._signature = self._file_signature()
+        components = self._load()
+        if components is None:
+            raise RuntimeError("Failed to load models")
+        if self.lazy:
+            # Finish loading in the background, so this version stops reading
+            # the files before a retrain can replace them
+            components.preload(background=True)
+        self._activate(components, self._read_version())
+
+    def _watched_files(self):
+        if self.bundle_path is not None:
+            return [self.bundle_path]
+        return [os.path.join(self.model_dir, filename) for filename in MODEL_ARTIFACT_FILES]
+
+    def _file_signature(self):
+        """
+        Cheap change detector: modification time and size of every watched file
+        """
+        signature = []
+        for path in self._watched_files():
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def _read_version(self):
+        """
+        Content-based version: the bundle's recorded fingerprint or a hash of the pickles
+        """
+        if self.bundle_path is not None:
+            from model_bundle import read_bundle_manifest
+            manifest = read_bundle_manifest(self.bundle_path)
+            return f"{manifest['model_fingerprint']}@{manifest['created_date']}"
+        return model_fingerprint(self.model_dir)
+
+    def _load(self):
+        if self.bundle_path is not None:
+            return load_all_models(bundle_path=self.bundle_path)
+        components = load_all_models(lazy=self.lazy, model_dir=self.model_dir)
+        # Pin the fingerprint now so a lazily loaded version can't report a newer one
+        if components is not None and self.lazy:
+            components['model_fingerprint'] = model_fingerprint(self.model_dir)
+        return components
+
+    def _activate(self, components, version):
+        self._active = components
+        self._version = version
+        self.loaded_at = datetime.now()
+
+    def current(self):
+        """
+        Components of the active model version
+
+        Callers should fetch this once per request and use that reference for
+        the whole request.
+        """
+        return self._active
+
+    @property
+    def version(self):
+        return self._version
+
+    def check_for_update(self):
+        """
+        Reload if the artifacts changed; safe to call from any thread
+
+        Returns:
+            True if a new version was swapped in
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            return False
+
+        with self._reload_lock:
+            # Wait until the writer is done before touching the files
+            time.sleep(self.settle_time)
+            if self._file_signature() != signature:
+                return False
+            self._signature = signature
+
+            try:
+                version = self._read_version()
+            except Exception as e:
+                self.last_error = f"Could not read model version: {e}"
+                return False
+            if version in (self._version, self._rejected_version):
+                return False
+
+            try:
+                components = self._load()
+                if components is None:
+                    raise ValueError("load_all_models returned None")
+                if hasattr(components, 'preload'):
+                    components.preload()
+                validate_components(components)
+            except Exception as e:
+                self._rejected_version = version
+                self.last_error = f"Rejected model version {version}: {e}"
+                print(f"Warning: {self.last_error}")
+                return False
+
+            self._activate(components, version)
+            self.reload_count += 1
+            self.last_error = None
+            print(f"Model version {version} is now active")
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check_for_update()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Error checking for model updates: {e}")
+
+    def start(self):
+        """
+        Start the background watcher thread (idempotent)
+
+        Returns:
+            self
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name='model-registry', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the watcher thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def status(self):
+        """
+        Active version, when it was loaded, reload count and last error
+        """
+        return {
+            'version': self._version,
+            'loaded_at': self.loaded_at.strftime('%Y-%m-%d %H:%M:%S') if self.loaded_at else None,
+            'reload_count': self.reload_count,
+            'last_error': self.last_error
+        }
@@ -0,0 +1,135 @@
+"""
+Bounded LRU cache in front of predict_single_student
+
+The Single Prediction form only produces a small set of distinct inputs
+(0.1 slider steps, fixed selectbox choices, integer ages and ratings), so
+repeated profiles are common. Entries are keyed by the canonicalized feature
+values plus the fingerprint of the loaded model artifacts; when a request
+arrives with a different fingerprint the cache is cleared, so a retrained
+model never serves stale predictions.
+"""
+import copy
+import threading
+from collections import OrderedDict
+
+from prediction_functions import predict_single_student
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of single-student prediction results
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(student_data, components, predict_kwargs=None):
+        """
+        Canonical key: the features in training order plus prediction options
+
+        Numbers are rounded to 6 decimals so 20, 20.0 and slider values such as
+        4.1000000000000005 share an entry; strings are kept as-is because
+        unseen categories are handled by the models.
+        """
+        values = []
+        for col in components['feature_info']['feature_columns']:
+            value = student_data[col]
+            if isinstance(value, str):
+                values.append(value)
+            else:
+                values.append(round(float(value), 6))
+        options = tuple(sorted((predict_kwargs or {}).items()))
+        return tuple(values), options
+
+    def predict(self, student_data, components, **predict_kwargs):
+        """
+        Return the cached prediction or compute and store it
+
+        Args:
+            student_data: Dictionary with student features
+            components: Dictionary with loaded models and preprocessors
+            **predict_kwargs: Passed through to predict_single_student
+
+        Returns:
+            Dictionary with predictions and probabilities (a private copy)
+        """
+        fingerprint = components.get('model_fingerprint')
+        key = self.make_key(student_data, components, predict_kwargs)
+
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                # Different model artifacts: every cached result is stale
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._fingerprint = fingerprint
+
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+            self.misses += 1
+
+        result = predict_single_student(student_data, components, **predict_kwargs)
+
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        return copy.deepcopy(result)
+
+    def clear(self):
+        """
+        Drop all entries (counters are kept)
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Hit/miss/eviction counters and current size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'model_fingerprint': self._fingerprint
+            }
+
+# Process-wide cache used by cached_predict_single_student
+default_prediction_cache = PredictionCache()
+
+def cached_predict_single_student(student_data, components, cache=None, **predict_kwargs):
+    """
+    predict_single_student behind an LRU cache
+
+    Args:
+        student_data: Dictionary with student features
+        components: Dictionary with loaded models and preprocessors
+        cache: PredictionCache to use (defaults to default_prediction_cache)
+        **predict_kwargs: Passed through to predict_single_student
+
+    Returns:
+        Dictionary with predictions and probabilities
+    """
+    if cache is None:
+        cache = default_prediction_cache
+    return cache.predict(student_data, components, **predict_kwargs)
@@ -2,36 +2,644 @@ import joblib
 import pandas as pd
 import numpy as np
 import json
+import os
+import threading
+import time
+from collections.abc import MutableMapping
+from functools import partial
 
-def load_all_models():
+from svm_engine import check_svm_engine_support, compile_svm_engine, fit_svm_approximation, svm_engine_predict
+from student_io import INTEGER_FEATURES, ResultWriter, iter_student_file
+
+# Pickled artifacts and the component names they are loaded into
+MODEL_ARTIFACTS = {
+    'lr_model': 'logistic_regression_model.pkl',
+    'svm_model': 'svm_model.pkl',
+    'scaler': 'scaler.pkl',
+    'target_encoder': 'target_label_encoder.pkl',
+    'feature_encoders': 'feature_label_encoders.pkl',
+    'feature_info': 'feature_info.pkl'
+}
+
+# Files that make up one trained model version
+MODEL_ARTIFACT_FILES = list(MODEL_ARTIFACTS.values()) + ['model_metadata.json']
+
+# Synthetic students the approximate SVM is checked against by default
+SVM_HOLDOUT_ROWS = 2000
+
+def model_fingerprint(model_dir):
     """
-    Load all trained models and preprocessing components
-    Returns: Dictionary with all components
+    Hash of the model artifact files, used to tell model versions apart
+    
+    Args:
+        model_dir: Directory containing the artifact files
+    
+    Returns:
+        Hex digest that changes whenever any artifact changes
     """
+    import hashlib
+    
+    digest = hashlib.sha256()
+    for filename in MODEL_ARTIFACT_FILES:
+        digest.update(filename.encode())
+        with open(os.path.join(model_dir, filename), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def _build_svm_engine(components):
+    # Single-pass SVM scoring needs an RBF model trained with probabilities
     try:
-        import os
-        # Get the directory of this file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
+        return compile_svm_engine(components['svm_model'])
+    except ValueError as e:
+        print(f"Warning: SVM engine not available: {e}")
+        return None
+
+def _svm_engine_supported(components):
+    try:
+        check_svm_engine_support(components['svm_model'])
+    except ValueError:
+        return False
+    return True
+
+# Components derived from the artifacts at load time
+DERIVED_COMPONENTS = {
+    # Fold the scaler into the logistic regression for the fast path
+    'linear_engine': lambda c: compile_linear_engine(c['lr_model'], c['scaler']),
+    # Precompile the label encoders into lookup tables
+    'encoding_tables': lambda c: compile_encoding_tables(c['feature_encoders'], c['feature_info']),
+    # Per-feature logit contributions for the table-driven LR scorer
+    'contribution_tables': lambda c: compile_contribution_tables(
+        c['lr_model'], c['scaler'], c['encoding_tables'], c['feature_info'], c['target_encoder'].classes_),
+    'svm_engine': _build_svm_engine,
+    'model_fingerprint': lambda c: model_fingerprint(c.model_dir)
+}
+
+# Checks for derived components that can't be built from every model, so
+# LazyComponents can leave them out of iteration without building them
+DERIVED_PREREQUISITES = {
+    'svm_engine': _svm_engine_supported
+}
+
+def _estimate_nbytes(obj, seen=None):
+    """
+    Rough in-memory size of a loaded component (numpy buffers plus containers)
+    """
+    import sys
+    
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_estimate_nbytes(k, seen) + _estimate_nbytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_estimate_nbytes(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += _estimate_nbytes(vars(obj), seen)
+    return size
+
+class LazyComponents(MutableMapping):
+    """
+    Components dictionary that loads each artifact on first access
+    
+    Behaves like the dictionary returned by load_all_models, so it can be
+    passed to every prediction function. Derived components (compiled engines,
+    lookup tables) are built on first access too, loading whatever artifacts
+    they depend on. Iteration leaves out derived components the models can't
+    provide (svm_engine for an SVM without probabilities), checking only the
+    artifacts they need. Per-component load time and estimated size are
+    recorded in load_stats().
+    """
+    
+    def __init__(self, model_dir=None):
+        self.model_dir = model_dir or os.path.dirname(os.path.abspath(__file__))
+        self._loaded = {}
+        self._unavailable = set()
+        self._stats = {}
+        self._lock = threading.RLock()
+        self._preload_thread = None
+        self.preload_error = None
+    
+    def _names(self):
+        return list(MODEL_ARTIFACTS) + ['metadata'] + list(DERIVED_COMPONENTS)
+    
+    def _load(self, name):
+        start = time.perf_counter()
+        if name in MODEL_ARTIFACTS:
+            value = joblib.load(os.path.join(self.model_dir, MODEL_ARTIFACTS[name]))
+        elif name == 'metadata':
+            with open(os.path.join(self.model_dir, 'model_metadata.json'), 'r') as f:
+                value = json.load(f)
+        else:
+            value = DERIVED_COMPONENTS[name](self)
+        seconds = time.perf_counter() - start
         
-        components = {
-            'lr_model': joblib.load(os.path.join(current_dir, 'logistic_regression_model.pkl')),
-            'svm_model': joblib.load(os.path.join(current_dir, 'svm_model.pkl')),
-            'scaler': joblib.load(os.path.join(current_dir, 'scaler.pkl')),
-            'target_encoder': joblib.load(os.path.join(current_dir, 'target_label_encoder.pkl')),
-            'feature_encoders': joblib.load(os.path.join(current_dir, 'feature_label_encoders.pkl')),
-            'feature_info': joblib.load(os.path.join(current_dir, 'feature_info.pkl'))
-        }
+        # Derived components include the time spent loading their dependencies
+        self._stats[name] = {'seconds': seconds, 'nbytes': _estimate_nbytes(value)}
+        return value
+    
+    def __getitem__(self, name):
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+        if name not in self._names() or name in self._unavailable:
+            raise KeyError(name)
+        
+        with self._lock:
+            if name not in self._loaded and name not in self._unavailable:
+                value = self._load(name)
+                if value is None:
+                    self._unavailable.add(name)
+                else:
+                    self._loaded[name] = value
+        
+        if name in self._unavailable:
+            raise KeyError(name)
+        return self._loaded[name]
+    
+    def __setitem__(self, name, value):
+        with self._lock:
+            self._loaded[name] = value
+            self._unavailable.discard(name)
+    
+    def __delitem__(self, name):
+        with self._lock:
+            del self._loaded[name]
+    
+    def _available(self, name):
+        if name in self._loaded:
+            return True
+        if name in self._unavailable:
+            return False
+        prerequisite = DERIVED_PREREQUISITES.get(name)
+        if prerequisite is not None and not prerequisite(self):
+            with self._lock:
+                self._unavailable.add(name)
+            return False
+        return True
+    
+    def __iter__(self):
+        # Only names __getitem__ can return, so dict(components) never hits a KeyError
+        names = [name for name in self._names() if self._available(name)]
+        return iter(names + [name for name in self._loaded if name not in names])
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def is_loaded(self, name):
+        """
+        True if the component has been loaded (without triggering a load)
+        """
+        return name in self._loaded
+    
+    def preload(self, background=False, names=None):
+        """
+        Load every component now, optionally on a daemon thread
+        
+        Args:
+            background: Return immediately and load on a background thread;
+                calling it again while a preload is running does nothing
+            names: Load only these components (e.g. from batch_component_names)
+        
+        Returns:
+            self
+        """
+        names = self._names() if names is None else list(names)
         
-        # Load metadata
-        with open(os.path.join(current_dir, 'model_metadata.json'), 'r') as f:
-            components['metadata'] = json.load(f)
-            
-        return components
+        def load_everything():
+            try:
+                for name in names:
+                    self.get(name)
+            except Exception as e:
+                self.preload_error = e
+                print(f"Error preloading models: {e}")
+        
+        if not background:
+            for name in names:
+                self.get(name)
+            return self
+        
+        with self._lock:
+            if self._preload_thread is None:
+                self._preload_thread = threading.Thread(target=load_everything, name='model-preload', daemon=True)
+                self._preload_thread.start()
+        return self
+    
+    def load_stats(self):
+        """
+        Per-component load time in seconds and estimated size in bytes
+        """
+        return {name: dict(stats) for name, stats in self._stats.items()}
+    
+    def to_dict(self):
+        """
+        Load everything and return a plain dictionary of the components
+        """
+        self.preload()
+        return dict(self._loaded)
+
+def load_all_models(lazy=False, bundle_path=None, model_dir=None):
+    """
+    Load all trained models and preprocessing components
+    
+    Args:
+        lazy: Return a LazyComponents container that loads each artifact on
+            first access instead of unpickling everything up front
+        bundle_path: Memory-map this model bundle (see model_bundle) instead of
+            loading the pickles; a mapped bundle is only paged in as it is
+            used, so lazy does not apply to it
+        model_dir: Directory with the pickles (defaults to model_and_others)
+    
+    Returns: Dictionary with all components
+    """
+    if lazy and bundle_path is None:
+        return LazyComponents(model_dir)
+    
+    try:
+        if bundle_path is not None:
+            from model_bundle import load_model_bundle
+            return load_model_bundle(bundle_path)
+        return LazyComponents(model_dir).to_dict()
     except Exception as e:
         print(f"Error loading models: {e}")
         return None
 
-def preprocess_input_data(data, feature_encoders, feature_info):
+def compile_linear_engine(lr_model, scaler):
+    """
+    Fold the StandardScaler into the Logistic Regression weights
+    
+    The model scores ((x - mean) / scale) @ coef.T + intercept, which is the
+    same as x @ (coef / scale).T + (intercept - coef @ (mean / scale)), so a
+    raw (encoded but unscaled) row can be scored with a single matmul.
+    
+    Args:
+        lr_model: Fitted LogisticRegression
+        scaler: Fitted StandardScaler used in front of lr_model
+    
+    Returns:
+        Dictionary with the folded weights and scaler statistics
+    """
+    coef = np.asarray(lr_model.coef_, dtype=np.float64)
+    intercept = np.asarray(lr_model.intercept_, dtype=np.float64)
+    n_features = coef.shape[1]
+    
+    mean = scaler.mean_ if getattr(scaler, 'mean_', None) is not None else np.zeros(n_features)
+    scale = scaler.scale_ if getattr(scaler, 'scale_', None) is not None else np.ones(n_features)
+    mean = np.asarray(mean, dtype=np.float64)
+    scale = np.asarray(scale, dtype=np.float64)
+    
+    weights = (coef / scale).T
+    bias = intercept - coef @ (mean / scale)
+    
+    # Older pickles carry multi_class; liblinear and 'ovr' use one-vs-rest sigmoids
+    multi_class = getattr(lr_model, 'multi_class', 'auto')
+    multinomial = coef.shape[0] > 1 and multi_class != 'ovr' and lr_model.solver != 'liblinear'
+    
+    return {
+        'weights': np.ascontiguousarray(weights),
+        'bias': bias,
+        'mean': mean,
+        'scale': scale,
+        'multinomial': multinomial
+    }
+
+def linear_engine_predict_proba(engine, X):
+    """
+    Class probabilities from a compiled linear engine
+    
+    Args:
+        engine: Dictionary from compile_linear_engine
+        X: 2-D array of encoded, unscaled features
+    
+    Returns:
+        Array of shape (n_rows, n_classes)
+    """
+    logits = X @ engine['weights'] + engine['bias']
+    
+    if logits.shape[1] == 1:
+        # Binary problem: sklearn returns [1 - p, p]
+        prob = 1.0 / (1.0 + np.exp(-logits))
+        return np.hstack([1.0 - prob, prob])
+    
+    if engine['multinomial']:
+        logits = logits - logits.max(axis=1, keepdims=True)
+        prob = np.exp(logits)
+    else:
+        prob = 1.0 / (1.0 + np.exp(-logits))
+    return prob / prob.sum(axis=1, keepdims=True)
+
+def compile_encoding_tables(feature_encoders, feature_info):
+    """
+    Precompile the categorical label encoders into dense lookup tables
+    
+    Args:
+        feature_encoders: Dictionary of label encoders for categorical features
+        feature_info: Dictionary with feature information
+    
+    Returns:
+        Dictionary mapping column name to its table: the encoder classes, a
+        value -> code dictionary and the code used for unseen values
+    """
+    tables = {}
+    for col in feature_info.get('categorical_columns', feature_encoders.keys()):
+        if col not in feature_encoders:
+            continue
+        classes = np.asarray(feature_encoders[col].classes_)
+        tables[col] = {
+            'classes': classes,
+            'codes': {value: code for code, value in enumerate(classes.tolist())},
+            # Unseen categories are treated as the first known class
+            'fallback': 0
+        }
+    return tables
+
+def compile_contribution_tables(lr_model, scaler, encoding_tables, feature_info, target_classes):
+    """
+    Precompute each feature's additive contribution to every class logit
+    
+    The model logit for class k is intercept_k + sum_j coef_kj * (x_j - mean_j) / scale_j,
+    so every categorical level maps to a fixed contribution vector and every
+    numeric feature to one multiply-add (x_j * slope_j + offset_j). Contributions
+    are measured from the training mean, which makes them exact per-feature
+    attributions of the logits.
+    
+    Args:
+        lr_model: Fitted LogisticRegression
+        scaler: Fitted StandardScaler used in front of lr_model
+        encoding_tables: Tables from compile_encoding_tables
+        feature_info: Dictionary with feature information
+        target_classes: Class labels from the target encoder
+    
+    Returns:
+        Dictionary with per-feature tables in feature_columns order
+    """
+    engine = compile_linear_engine(lr_model, scaler)
+    coef = np.asarray(lr_model.coef_, dtype=np.float64)
+    slopes = coef / engine['scale']
+    offsets = -slopes * engine['mean']
+    
+    # Plain Python floats: the scorer does scalar arithmetic only
+    def as_floats(values):
+        return tuple(float(v) for v in values)
+    
+    features = []
+    for j, col in enumerate(feature_info['feature_columns']):
+        if col in encoding_tables:
+            table = encoding_tables[col]
+            levels = {value: as_floats(slopes[:, j] * code + offsets[:, j]) for value, code in table['codes'].items()}
+            fallback = as_floats(slopes[:, j] * table['fallback'] + offsets[:, j])
+            features.append((col, 'categorical', levels, fallback))
+        else:
+            features.append((col, 'numeric', as_floats(slopes[:, j]), as_floats(offsets[:, j])))
+    
+    return {
+        'features': features,
+        'intercept': tuple(float(b) for b in lr_model.intercept_),
+        'multinomial': engine['multinomial'],
+        'classes': [str(c) for c in target_classes]
+    }
+
+def score_with_contributions(student_data, tables, with_contributions=False):
+    """
+    Score one student with the Logistic Regression contribution tables
+    
+    Uses plain Python arithmetic over 14 table lookups per class, with no
+    DataFrame or array construction, for latency-critical callers.
+    
+    Args:
+        student_data: Dictionary with student features
+        tables: Dictionary from compile_contribution_tables
+        with_contributions: Also return the per-feature logit contributions
+    
+    Returns:
+        Dictionary with prediction, confidence, probabilities and optionally
+        contributions ({feature: {class: logit contribution}})
+    
+    Raises:
+        ValueError: If a numeric value is missing, non-numeric or infinite
+    """
+    import math
+    
+    logits = list(tables['intercept'])
+    n_logits = len(logits)
+    contributions = {} if with_contributions else None
+    
+    for col, kind, first, second in tables['features']:
+        value = student_data[col]
+        if kind == 'categorical':
+            contribution = first.get(value)
+            if contribution is None:
+                print(f"Warning: Unseen categories in {col}: {{{value!r}}}")
+                contribution = second
+        else:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid value for {col}: {value!r}") from None
+            if not math.isfinite(value):
+                raise ValueError(f"Missing or non-finite values in {[col]}")
+            contribution = [value * first[k] + second[k] for k in range(n_logits)]
+        
+        for k in range(n_logits):
+            logits[k] += contribution[k]
+        if contributions is not None:
+            contributions[col] = contribution
+    
+    if n_logits == 1:
+        # Binary problem: the single logit scores the second class
+        positive = 1.0 / (1.0 + math.exp(-logits[0]))
+        probabilities = [1.0 - positive, positive]
+    elif tables['multinomial']:
+        top = max(logits)
+        exps = [math.exp(z - top) for z in logits]
+        total = sum(exps)
+        probabilities = [e / total for e in exps]
+    else:
+        sigmoids = [1.0 / (1.0 + math.exp(-z)) for z in logits]
+        total = sum(sigmoids)
+        probabilities = [p / total for p in sigmoids]
+    
+    classes = tables['classes']
+    best = max(range(len(probabilities)), key=probabilities.__getitem__)
+    result = {
+        'prediction': classes[best],
+        'confidence': probabilities[best],
+        'probabilities': dict(zip(classes, probabilities)),
+        'risk_level': get_risk_level(classes[best])
+    }
+    
+    if contributions is not None:
+        logit_names = classes if n_logits == len(classes) else classes[1:]
+        result['contributions'] = {
+            col: dict(zip(logit_names, contribution)) for col, contribution in contributions.items()
+        }
+    
+    return result
+
+def encode_features(data, components, out=None):
+    """
+    Encode students into an unscaled feature matrix without pandas
+    
+    Args:
+        data: One student as a dict or as a tuple/list in
+            feature_info['feature_columns'] order, a list of such rows, or a
+            2-D numpy array in that column order (a numeric array is taken as
+            already label-encoded, an object array is encoded column by column)
+        components: Dictionary with loaded models and preprocessors
+        out: Optional preallocated float64 array of shape (n_rows, n_features)
+    
+    Returns:
+        Float64 array of shape (n_rows, n_features); unseen categories are
+        mapped to the first known class, as in preprocess_input_data
+    
+    Raises:
+        ValueError: If a numeric value is missing (None/NaN) or infinite
+    """
+    feature_columns = components['feature_info']['feature_columns']
+    tables = components.get('encoding_tables')
+    if tables is None:
+        tables = compile_encoding_tables(components['feature_encoders'], components['feature_info'])
+    
+    if isinstance(data, np.ndarray):
+        rows = None
+        n_rows = data.shape[0]
+        if data.ndim != 2 or data.shape[1] != len(feature_columns):
+            raise ValueError(f"Expected an array of shape (n_rows, {len(feature_columns)}), got {data.shape}")
+    else:
+        single = isinstance(data, dict) or (len(data) > 0 and not isinstance(data[0], (dict, tuple, list)))
+        rows = [data] if single else data
+        n_rows = len(rows)
+    
+    if out is None:
+        out = np.empty((n_rows, len(feature_columns)), dtype=np.float64)
+    elif out.shape != (n_rows, len(feature_columns)):
+        raise ValueError(f"out has shape {out.shape}, expected {(n_rows, len(feature_columns))}")
+    
+    for j, col in enumerate(feature_columns):
+        table = tables.get(col)
+        
+        if rows is not None:
+            if table is None:
+                for i, row in enumerate(rows):
+                    out[i, j] = row[col] if isinstance(row, dict) else row[j]
+                continue
+            codes = table['codes']
+            for i, row in enumerate(rows):
+                value = row[col] if isinstance(row, dict) else row[j]
+                code = codes.get(value)
+                if code is None:
+                    print(f"Warning: Unseen categories in {col}: {{{value!r}}}")
+                    code = table['fallback']
+                out[i, j] = code
+        elif table is None or data.dtype.kind in 'biuf':
+            out[:, j] = data[:, j]
+        else:
+            # Map each distinct value once, then broadcast the codes back
+            uniques, inverse = np.unique(data[:, j].astype(str), return_inverse=True)
+            unique_codes = np.array([table['codes'].get(value, -1) for value in uniques.tolist()])
+            if (unique_codes < 0).any():
+                print(f"Warning: Unseen categories in {col}: {set(uniques[unique_codes < 0].tolist())}")
+                unique_codes[unique_codes < 0] = table['fallback']
+            out[:, j] = unique_codes[inverse.ravel()]
+    
+    # None and NaN would otherwise score as NaN probabilities instead of failing like sklearn
+    finite = np.isfinite(out).all(axis=0)
+    if not finite.all():
+        bad_columns = [feature_columns[j] for j in np.flatnonzero(~finite)]
+        raise ValueError(f"Missing or non-finite values in {bad_columns}")
+    
+    return out
+
+def scale_features(X, components, out=None):
+    """
+    Standardize an encoded feature matrix with the scaler statistics
+    
+    Args:
+        X: Float array from encode_features
+        components: Dictionary with loaded models and preprocessors
+        out: Optional preallocated array (may be X itself to scale in place)
+    
+    Returns:
+        Scaled array
+    """
+    engine = components['linear_engine']
+    if out is None:
+        out = np.empty_like(X)
+    np.subtract(X, engine['mean'], out=out)
+    np.divide(out, engine['scale'], out=out)
+    return out
+
+def predict_students_array(data, components, svm_mode='single_pass', label_policy='predict',
+                           block_size=None, float32=False, parallel_models=False):
+    """
+    Score students from dicts, tuples or arrays without building a DataFrame
+    
+    Args:
+        data: Anything encode_features accepts
+        components: Dictionary with loaded models and preprocessors
+        svm_mode, label_policy, block_size, float32: See score_svm
+        parallel_models: Run Logistic Regression and SVM concurrently
+    
+    Returns:
+        Dictionary of arrays: lr_pred and svm_pred (encoded classes),
+        lr_prob and svm_prob (class probabilities)
+    """
+    X = encode_features(data, components)
+    X_scaled = scale_features(X, components)
+    
+    lr_task = partial(score_lr_engine, X, components['linear_engine'])
+    svm_task = partial(score_svm, X_scaled, components, svm_mode, label_policy, block_size, float32)
+    (lr_pred, lr_prob), (svm_pred, svm_prob) = run_models(lr_task, svm_task, parallel_models)
+    
+    return {'lr_pred': lr_pred, 'lr_prob': lr_prob, 'svm_pred': svm_pred, 'svm_prob': svm_prob}
+
+def predict_students(data, components, **predict_kwargs):
+    """
+    Per-student result dictionaries (as returned by predict_single_student)
+    for anything encode_features accepts
+    """
+    scores = predict_students_array(data, components, **predict_kwargs)
+    classes = components['target_encoder'].classes_
+    return [
+        format_student_result(classes, lr_pred, lr_prob, svm_pred, svm_prob)
+        for lr_pred, lr_prob, svm_pred, svm_prob
+        in zip(scores['lr_pred'], scores['lr_prob'], scores['svm_pred'], scores['svm_prob'])
+    ]
+
+def verify_linear_engine(components, data_df=None, atol=1e-9):
+    """
+    Check that the compiled linear engine matches the sklearn pipeline
+    
+    Args:
+        components: Dictionary with loaded models and preprocessors
+        data_df: DataFrame with student features (defaults to the sample upload template)
+        atol: Maximum allowed absolute difference in probabilities
+    
+    Returns:
+        Tuple (is_equivalent, max_abs_difference)
+    """
+    if data_df is None:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        data_df = pd.read_csv(os.path.join(current_dir, 'sample_upload_template.csv'))
+    
+    feature_columns = components['feature_info']['feature_columns']
+    df_processed = preprocess_input_data(data_df[feature_columns], components['feature_encoders'], components['feature_info'], components.get('encoding_tables'))
+    
+    expected = components['lr_model'].predict_proba(components['scaler'].transform(df_processed))
+    actual = linear_engine_predict_proba(components['linear_engine'], df_processed.to_numpy(dtype=np.float64))
+    
+    max_diff = float(np.max(np.abs(expected - actual)))
+    labels_match = bool(np.array_equal(expected.argmax(axis=1), actual.argmax(axis=1)))
+    
+    return labels_match and max_diff <= atol, max_diff
+
+def preprocess_input_data(data, feature_encoders, feature_info, encoding_tables=None):
     """
     Preprocess input data for prediction
     
@@ -39,12 +647,20 @@ def preprocess_input_data(data, feature_encoders, feature_info):
         data: DataFrame with student features
         feature_encoders: Dictionary of label encoders for categorical features
         feature_info: Dictionary with feature information
+        encoding_tables: Optional tables from compile_encoding_tables; when
+            given, each column is encoded in a single vectorized pass
     
     Returns:
         Preprocessed DataFrame ready for scaling
     """
     processed_data = data.copy()
     
+    if encoding_tables is not None:
+        for col, table in encoding_tables.items():
+            if col in processed_data.columns:
+                processed_data[col] = encode_categorical_column(processed_data[col], table, col)
+        return processed_data
+    
     # Get categorical columns (fallback if not in feature_info)
     if 'categorical_columns' in feature_info:
         categorical_columns = feature_info['categorical_columns']
@@ -84,36 +700,201 @@ def preprocess_input_data(data, feature_encoders, feature_info):
     
     return processed_data
 
-def predict_single_student(student_data, components):
+def encode_categorical_column(values, table, col):
+    """
+    Map a column to label-encoder codes with a precompiled table
+    
+    Unseen values (including missing ones) are mapped to the fallback code in
+    the same pass instead of being replaced one category at a time.
+    """
+    codes = pd.Categorical(values, categories=table['classes']).codes.astype(np.int64)
+    
+    unseen_mask = codes < 0
+    if unseen_mask.any():
+        unseen_categories = set(pd.unique(np.asarray(values)[unseen_mask]))
+        print(f"Warning: Unseen categories in {col}: {unseen_categories}")
+        codes[unseen_mask] = table['fallback']
+    
+    return codes
+
+def svm_holdout_students(components, n_rows=SVM_HOLDOUT_ROWS, random_state=0):
+    """
+    Seeded synthetic students, encoded and scaled like real input
+    
+    Returns:
+        2-D array of scaled features for the SVM fidelity report
+    """
+    from synthetic_students import generate_students
+    
+    students = generate_students(n_rows, random_state=random_state, decimals=1)
+    columns = components['feature_info']['feature_columns']
+    return scale_features(encode_features(students[columns].to_numpy(dtype=object), components), components)
+
+def build_svm_approximation(components, n_components=64, X_holdout=None):
+    """
+    Fit the approximate SVM backend and store it in components
+    
+    Args:
+        components: Dictionary with loaded models and preprocessors
+        n_components: Number of landmark vectors (fewer is faster, less exact)
+        X_holdout: Scaled holdout rows for the fidelity report (defaults to
+            svm_holdout_students)
+    
+    Returns:
+        The approximate engine; its 'fidelity' entry compares it to the exact SVM
+    """
+    if 'svm_engine' not in components:
+        raise ValueError("Approximate SVM requires the compiled SVM engine")
+    
+    if X_holdout is None:
+        X_holdout = svm_holdout_students(components)
+    approx = fit_svm_approximation(components['svm_engine'], X_holdout, n_components)
+    fidelity = approx['fidelity']
+    print(f"SVM approximation with {fidelity['approx_support_vectors']} of "
+          f"{fidelity['exact_support_vectors']} support vectors: "
+          f"{fidelity['label_agreement']:.1%} label agreement on {fidelity['holdout_rows']} holdout rows")
+    
+    components['svm_approximation'] = approx
+    return approx
+
+def score_svm(df_scaled, components, svm_mode='sklearn', label_policy='predict', block_size=None, float32=False):
+    """
+    Run the SVM on scaled features
+    
+    Args:
+        df_scaled: 2-D array of scaled features
+        components: Dictionary with loaded models and preprocessors
+        svm_mode: 'sklearn' for SVC.predict + SVC.predict_proba, 'single_pass'
+            to evaluate the kernel once with the compiled SVM engine,
+            'approximate' for the Nystroem backend (fitted with defaults on
+            first use unless build_svm_approximation was called)
+        label_policy: How the single-pass label is chosen, see svm_engine
+        block_size: Rows per kernel block for the single-pass engine
+        float32: Compute single-pass kernels in single precision
+    
+    Returns:
+        Tuple (predictions, probabilities)
+    """
+    # Bundles only carry the compiled engine, not the sklearn SVC
+    if svm_mode == 'sklearn' and 'svm_model' not in components:
+        svm_mode = 'single_pass'
+    
+    if svm_mode == 'single_pass' and 'svm_engine' in components:
+        return svm_engine_predict(components['svm_engine'], df_scaled, label_policy, block_size, float32)
+    if svm_mode == 'approximate':
+        approx = components.get('svm_approximation') or build_svm_approximation(components)
+        return svm_engine_predict(approx, df_scaled, label_policy, block_size, float32)
+    if svm_mode not in ('sklearn', 'single_pass'):
+        raise ValueError(f"Unknown svm_mode: {svm_mode!r}")
+    
+    return components['svm_model'].predict(df_scaled), components['svm_model'].predict_proba(df_scaled)
+
+def score_lr(df_scaled, components):
+    """
+    Run Logistic Regression on scaled features
+    
+    Returns:
+        Tuple (predictions, probabilities)
+    """
+    return components['lr_model'].predict(df_scaled), components['lr_model'].predict_proba(df_scaled)
+
+def score_lr_engine(X, engine):
+    """
+    Run the compiled linear engine on encoded, unscaled features
+    
+    Returns:
+        Tuple (predictions, probabilities)
+    """
+    prob = linear_engine_predict_proba(engine, X)
+    return np.argmax(prob, axis=1), prob
+
+# Thread pool shared by every prediction that runs both models concurrently
+_model_pool = None
+_model_pool_lock = threading.Lock()
+
+def _reset_model_pool():
+    # A forked child inherits the pool object but none of its threads, so it builds its own
+    global _model_pool, _model_pool_lock
+    _model_pool = None
+    _model_pool_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_model_pool)
+
+def _get_model_pool():
+    global _model_pool
+    
+    if _model_pool is None:
+        with _model_pool_lock:
+            if _model_pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+                _model_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='model')
+    return _model_pool
+
+def run_models(lr_task, svm_task, parallel_models=False):
+    """
+    Evaluate the Logistic Regression and SVM tasks, optionally concurrently
+    
+    Either task may be None to skip that model; its result is then None.
+    With parallel_models the SVM runs on a shared thread pool while the LR runs
+    in the calling thread; numpy/BLAS release the GIL, so wall-clock time is
+    close to the slower of the two.
+    
+    Returns:
+        Tuple (lr_result, svm_result)
+    """
+    if svm_task is None or lr_task is None:
+        return (lr_task() if lr_task else None), (svm_task() if svm_task else None)
+    
+    if not parallel_models:
+        return lr_task(), svm_task()
+    
+    svm_future = _get_model_pool().submit(svm_task)
+    lr_result = lr_task()
+    return lr_result, svm_future.result()
+
+def predict_single_student(student_data, components, use_linear_engine=False, svm_mode='sklearn', parallel_models=False):
     """
     Predict performance for a single student
     
     Args:
         student_data: Dictionary with student features
         components: Dictionary with loaded models and preprocessors
+        use_linear_engine: Score Logistic Regression with the compiled linear
+            engine instead of the DataFrame/sklearn pipeline
+        svm_mode: 'sklearn', 'single_pass' or 'approximate', see score_svm
+        parallel_models: Run Logistic Regression and SVM concurrently
     
     Returns:
         Dictionary with predictions and probabilities
     """
+    if use_linear_engine and 'linear_engine' in components:
+        # Encode straight into a row vector, skipping DataFrame construction
+        return predict_students(student_data, components, svm_mode=svm_mode, parallel_models=parallel_models)[0]
+    
     # Convert to DataFrame
     df = pd.DataFrame([student_data])
     
     # Preprocess
-    df_processed = preprocess_input_data(df, components['feature_encoders'], components['feature_info'])
+    df_processed = preprocess_input_data(df, components['feature_encoders'], components['feature_info'], components.get('encoding_tables'))
     
     # Scale features
     df_scaled = components['scaler'].transform(df_processed)
     
     # Make predictions
-    lr_pred = components['lr_model'].predict(df_scaled)[0]
-    lr_prob = components['lr_model'].predict_proba(df_scaled)[0]
-    
-    svm_pred = components['svm_model'].predict(df_scaled)[0]
-    svm_prob = components['svm_model'].predict_proba(df_scaled)[0]
+    lr_task = partial(score_lr, df_scaled, components)
+    svm_task = partial(score_svm, df_scaled, components, svm_mode)
+    (lr_pred, lr_prob), (svm_pred, svm_prob) = run_models(lr_task, svm_task, parallel_models)
     
     # Get class labels
     classes = components['target_encoder'].classes_
     
+    return format_student_result(classes, lr_pred[0], lr_prob[0], svm_pred[0], svm_prob[0])
+
+def format_student_result(classes, lr_pred, lr_prob, svm_pred, svm_prob):
+    """
+    Build the result dictionary for one student from both models' outputs
+    """
     return {
         'primary_prediction': {
             'model': 'Logistic Regression',
@@ -133,18 +914,36 @@ def predict_single_student(student_data, components):
         'risk_level': get_risk_level(classes[lr_pred])
     }
 
-def predict_batch_students(data_df, components):
+def predict_batch_students(data_df, components, svm_mode='sklearn', svm_block_size=None, svm_float32=False,
+                           parallel_models=False, dedupe=False, models='both', timings=None):
     """
     Predict performance for multiple students from CSV
     
     Args:
         data_df: DataFrame with student features
         components: Dictionary with loaded models and preprocessors
+        svm_mode: 'sklearn', 'single_pass' or 'approximate', see score_svm
+        svm_block_size: Rows per kernel block in the engine modes
+        svm_float32: Compute engine-mode kernels in single precision
+        parallel_models: Run Logistic Regression and SVM concurrently
+        dedupe: Score each distinct feature row once and copy the result to
+            its duplicates; the counts are stored in results.attrs
+        models: 'both', 'lr' or 'svm'; with a single model only its columns
+            are returned and Risk_Level follows that model
+        timings: Optional dictionary; seconds spent in each stage ('clean',
+            'preprocess', 'scale', 'lr', 'svm', 'assemble') are added to it
     
     Returns:
-        DataFrame with predictions
+        DataFrame with predictions; the label columns are categoricals and
+        LR_Confidence and SVM_Confidence are float32 fractions in [0, 1],
+        see format_batch_results for percentage strings
     """
+    if models not in ('both', 'lr', 'svm'):
+        raise ValueError(f"Unknown models {models!r}, expected 'both', 'lr' or 'svm'")
+    
     try:
+        stage_start = time.perf_counter()
+        
         # Validate input data first
         is_valid, missing_cols, extra_cols = validate_input_data(data_df)
         
@@ -166,7 +965,9 @@ def predict_batch_students(data_df, components):
         
         # Clean and validate categorical columns
         for col, valid_values in categorical_mappings.items():
-            if col in df_copy.columns:
+            if col in df_copy.columns and isinstance(df_copy[col].dtype, pd.CategoricalDtype):
+                df_copy[col] = clean_categorical_column(df_copy[col], valid_values, col)
+            elif col in df_copy.columns:
                 # Convert to string and strip whitespace
                 df_copy[col] = df_copy[col].astype(str).str.strip()
                 
@@ -185,37 +986,76 @@ def predict_batch_students(data_df, components):
         for col in numeric_columns:
             if col in df_copy.columns:
                 df_copy[col] = pd.to_numeric(df_copy[col], errors='coerce')
+                # Nullable integer columns (e.g. Int8 from read_student_csv) can't hold a fractional median
+                if df_copy[col].dtype.kind != 'f':
+                    df_copy[col] = df_copy[col].astype(np.float64)
                 
                 # Fill any NaN values with median
                 if df_copy[col].isna().any():
                     median_val = df_copy[col].median()
-                    df_copy[col].fillna(median_val, inplace=True)
+                    df_copy[col] = df_copy[col].fillna(median_val)
                     print(f"Warning: Filled NaN values in {col} with median: {median_val}")
         
-        # Preprocess the cleaned data
-        df_processed = preprocess_input_data(df_copy, components['feature_encoders'], components['feature_info'])
+        stage_start = _record_timing(timings, 'clean', stage_start)
+        
+        # Collapse duplicate feature rows so each distinct student is scored once
+        inverse = None
+        if dedupe:
+            df_copy, inverse = collapse_duplicate_rows(df_copy, components['feature_info']['feature_columns'])
+        
+        # Preprocess the cleaned data (extra columns such as IDs are left out)
+        df_processed = preprocess_input_data(df_copy[components['feature_info']['feature_columns']], components['feature_encoders'], components['feature_info'], components.get('encoding_tables'))
+        
+        stage_start = _record_timing(timings, 'preprocess', stage_start)
         
         # Scale features
         df_scaled = components['scaler'].transform(df_processed)
+        _record_timing(timings, 'scale', stage_start)
         
         # Make predictions
-        lr_pred = components['lr_model'].predict(df_scaled)
-        lr_prob = components['lr_model'].predict_proba(df_scaled)
+        lr_task = svm_task = None
+        if models in ('both', 'lr'):
+            lr_task = _timed(partial(score_lr, df_scaled, components), timings, 'lr')
+        if models in ('both', 'svm'):
+            svm_task = _timed(partial(score_svm, df_scaled, components, svm_mode,
+                                      block_size=svm_block_size, float32=svm_float32), timings, 'svm')
+        lr_result, svm_result = run_models(lr_task, svm_task, parallel_models)
+        stage_start = time.perf_counter()
         
-        svm_pred = components['svm_model'].predict(df_scaled)
-        svm_prob = components['svm_model'].predict_proba(df_scaled)
+        # Scatter the unique-row results back to every duplicate
+        if inverse is not None:
+            if lr_result is not None:
+                lr_result = (lr_result[0][inverse], lr_result[1][inverse])
+            if svm_result is not None:
+                svm_result = (svm_result[0][inverse], svm_result[1][inverse])
         
-        # Get class labels
-        classes = components['target_encoder'].classes_
+        # Get class labels and the risk level of each class
+        classes = [str(c) for c in components['target_encoder'].classes_]
+        risk_levels, class_risk = np.unique([get_risk_level(c) for c in classes], return_inverse=True)
         
-        # Create results DataFrame
-        results = data_df.copy()  # Use original data for display
-        results['LR_Prediction'] = [classes[pred] for pred in lr_pred]
-        results['LR_Confidence'] = [f"{max(prob):.1%}" for prob in lr_prob]
-        results['SVM_Prediction'] = [classes[pred] for pred in svm_pred]
-        results['SVM_Confidence'] = [f"{max(prob):.1%}" for prob in svm_prob]
-        results['Model_Agreement'] = lr_pred == svm_pred
-        results['Risk_Level'] = [get_risk_level(classes[pred]) for pred in lr_pred]
+        # Create results DataFrame; a shallow copy shares the original data for display.
+        # Labels are categoricals built straight from the class codes, confidences float32
+        results = data_df.copy(deep=False)
+        if lr_result is not None:
+            lr_pred, lr_prob = lr_result
+            results['LR_Prediction'] = pd.Categorical.from_codes(lr_pred, categories=classes)
+            results['LR_Confidence'] = lr_prob.max(axis=1).astype(np.float32)
+        if svm_result is not None:
+            svm_pred, svm_prob = svm_result
+            results['SVM_Prediction'] = pd.Categorical.from_codes(svm_pred, categories=classes)
+            results['SVM_Confidence'] = svm_prob.max(axis=1).astype(np.float32)
+        if lr_result is not None and svm_result is not None:
+            results['Model_Agreement'] = lr_pred == svm_pred
+        risk_pred = lr_pred if lr_result is not None else svm_pred
+        results['Risk_Level'] = pd.Categorical.from_codes(np.take(class_risk.ravel(), risk_pred), categories=risk_levels.tolist())
+        _record_timing(timings, 'assemble', stage_start)
+        
+        if inverse is not None:
+            n_unique = len(df_copy)
+            results.attrs['unique_rows'] = n_unique
+            results.attrs['dedup_ratio'] = 1 - n_unique / len(results) if len(results) else 0.0
+            print(f"Scored {n_unique} unique rows for {len(results)} students "
+                  f"({results.attrs['dedup_ratio']:.1%} duplicates)")
         
         return results
         
@@ -223,6 +1063,318 @@ def predict_batch_students(data_df, components):
         print(f"Error in batch prediction: {str(e)}")
         raise e
 
+def _record_timing(timings, stage, start):
+    """
+    Add the seconds since start to timings[stage] (if timings is given)
+    
+    Returns:
+        The current time, to start the next stage
+    """
+    now = time.perf_counter()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + now - start
+    return now
+
+def _timed(task, timings, stage):
+    """
+    Wrap a task so its run time is recorded under stage
+    """
+    if timings is None:
+        return task
+    
+    def run():
+        start = time.perf_counter()
+        try:
+            return task()
+        finally:
+            _record_timing(timings, stage, start)
+    return run
+
+def clean_categorical_column(values, valid_values, col):
+    """
+    Strip and validate a Category column one category at a time
+    
+    Gives the same result as the string path in predict_batch_students
+    (missing and invalid values become the first valid value) without
+    materializing a string per row.
+    
+    Returns:
+        Categorical Series with categories valid_values
+    """
+    # Missing values have code -1, which picks the trailing 'nan' label
+    labels = values.cat.categories.astype(str).str.strip().tolist() + ['nan']
+    category_codes = np.array([valid_values.index(label) if label in valid_values else -1 for label in labels], dtype=np.int64)
+    
+    row_codes = values.cat.codes.to_numpy()
+    codes = category_codes[row_codes]
+    
+    invalid_mask = codes < 0
+    if invalid_mask.any():
+        invalid_values = np.array(labels, dtype=object)[pd.unique(row_codes[invalid_mask])]
+        print(f"Warning: Invalid values in {col}: {invalid_values}")
+        codes[invalid_mask] = 0
+    
+    return pd.Series(pd.Categorical.from_codes(codes, categories=valid_values), index=values.index, name=values.name)
+
+def format_batch_results(results):
+    """
+    Copy of batch results with the confidence columns as percentage strings
+    (e.g. "87.5%"), for display or export
+    
+    Whole-number features that read_student_csv parsed as floats are shown
+    as integers again.
+    
+    Args:
+        results: DataFrame returned by predict_batch_students
+    
+    Returns:
+        Formatted DataFrame
+    """
+    formatted = results.copy(deep=False)
+    for col in ('LR_Confidence', 'SVM_Confidence'):
+        if col in formatted.columns:
+            formatted[col] = np.char.mod('%.1f%%', formatted[col].to_numpy(dtype=np.float64) * 100)
+    for col in INTEGER_FEATURES:
+        if col in formatted.columns and formatted[col].dtype.kind == 'f':
+            values = formatted[col]
+            if ((values % 1 == 0) | values.isna()).all():
+                formatted[col] = values.astype('Int64')
+    return formatted
+
+def collapse_duplicate_rows(df, feature_columns):
+    """
+    Keep the first occurrence of each distinct feature row
+    
+    Rows are compared through a 64-bit hash of their feature values, which is
+    much cheaper than sorting or comparing the raw columns.
+    
+    Args:
+        df: Cleaned DataFrame with student features
+        feature_columns: Columns that define a duplicate
+    
+    Returns:
+        Tuple (unique_df, inverse) where unique_df.iloc[inverse] rebuilds df
+    """
+    row_hashes = pd.util.hash_pandas_object(df[feature_columns], index=False).to_numpy()
+    _, first_index, inverse = np.unique(row_hashes, return_index=True, return_inverse=True)
+    
+    # Keep the unique rows in file order
+    order = np.argsort(first_index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    
+    return df.iloc[first_index[order]], rank[inverse.ravel()]
+
+def batch_component_names(models='both', svm_mode='sklearn'):
+    """
+    Components predict_batch_students needs for the selected models
+    
+    Preloading only these keeps an LR-only run from unpickling and compiling
+    the SVM.
+    
+    Args:
+        models: 'both', 'lr' or 'svm'
+        svm_mode: See score_svm
+    
+    Returns:
+        List of component names
+    """
+    names = ['feature_info', 'feature_encoders', 'encoding_tables', 'scaler', 'target_encoder']
+    if models in ('both', 'lr'):
+        names.append('lr_model')
+    if models in ('both', 'svm'):
+        names += ['svm_model'] if svm_mode == 'sklearn' else ['svm_engine']
+    return names
+
+# Components loaded once per worker process by _init_prediction_worker
+_worker_components = None
+
+def _init_prediction_worker(blas_threads, bundle_path=None, component_names=None):
+    """
+    Process pool initializer: load the models once for the worker's lifetime
+    
+    With component_names (and no bundle) only those components are loaded.
+    """
+    global _worker_components
+    
+    # One BLAS thread per worker, otherwise n_workers x n_cores threads compete
+    if blas_threads is not None:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=blas_threads)
+    
+    if component_names is not None and bundle_path is None:
+        _worker_components = LazyComponents().preload(names=component_names)
+        return
+    
+    # Workers mapping the same bundle share its pages instead of each unpickling a copy
+    _worker_components = load_all_models(bundle_path=bundle_path)
+    if _worker_components is None:
+        raise RuntimeError("Worker failed to load models")
+
+def _predict_shard(shard, predict_kwargs):
+    """
+    Score one shard inside a worker process
+    """
+    return predict_batch_students(shard, _worker_components, **predict_kwargs)
+
+def _predict_shard_timed(shard, predict_kwargs):
+    """
+    Score one shard inside a worker process and return its stage timings too
+    """
+    timings = {}
+    results = predict_batch_students(shard, _worker_components, timings=timings, **predict_kwargs)
+    return results, timings
+
+def predict_batch_parallel(data_df, n_workers=None, shard_size=50000, blas_threads=1, bundle_path=None,
+                           **predict_kwargs):
+    """
+    Predict performance for multiple students across a process pool
+    
+    Each worker loads the models once in its initializer and scores whole
+    shards; results are concatenated back in the original row order.
+    
+    Args:
+        data_df: DataFrame with student features
+        n_workers: Number of worker processes (defaults to the CPU count)
+        shard_size: Number of rows sent to a worker per task
+        blas_threads: BLAS threads per worker (None leaves the default)
+        bundle_path: Have workers memory-map this model bundle instead of
+            loading the pickles
+        **predict_kwargs: Passed through to predict_batch_students
+    
+    Returns:
+        DataFrame with predictions
+    
+    Raises:
+        ValueError: If columns are missing or data_df has no rows
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import repeat
+    
+    is_valid, missing_cols, extra_cols = validate_input_data(data_df)
+    if not is_valid:
+        raise ValueError(f"Missing required columns: {missing_cols}")
+    
+    if data_df.empty:
+        raise ValueError("No students to score")
+    
+    shards = [data_df.iloc[start:start + shard_size] for start in range(0, len(data_df), shard_size)]
+    n_workers = min(n_workers or os.cpu_count() or 1, len(shards))
+    component_names = batch_component_names(predict_kwargs.get('models', 'both'), predict_kwargs.get('svm_mode', 'sklearn'))
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_prediction_worker,
+                             initargs=(blas_threads, bundle_path, component_names)) as executor:
+        # map() yields in submission order, which keeps the original row order
+        results = list(executor.map(_predict_shard, shards, repeat(predict_kwargs)))
+    
+    return pd.concat(results)
+
+def _timed_chunks(chunks, timings, stage):
+    """
+    Iterate over chunks, recording the time spent producing each one
+    """
+    chunks = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            return
+        _record_timing(timings, stage, start)
+        yield chunk
+
+def iter_batch_predictions(source, components, chunk_size=50000, keep_columns=None, file_format=None,
+                           n_workers=None, bundle_path=None, timings=None, **predict_kwargs):
+    """
+    Stream predictions for a student file that may not fit in memory
+    
+    The file is read, cleaned, encoded, scaled and scored one chunk at a time,
+    so peak memory is bounded by chunk_size rather than by the file size.
+    Only the feature columns are read, in compact dtypes (see
+    read_student_csv), and the header is checked before any row is scored.
+    Missing numeric values are filled with the median of their own chunk.
+    
+    With n_workers > 1 chunks are scored in a process pool (see
+    predict_batch_parallel); at most two chunks per worker are in flight, so
+    memory stays bounded.
+    
+    Args:
+        source: Path or file-like object with CSV, Parquet or Arrow IPC student data
+        components: Dictionary with loaded models and preprocessors (only
+            feature_info is used when scoring in worker processes)
+        chunk_size: Number of rows per chunk
+        keep_columns: Extra input columns (e.g. a student ID) to copy into the results
+        file_format: 'csv', 'parquet' or 'arrow' (defaults to the file extension)
+        n_workers: Worker processes for scoring (None or 1 scores in this process)
+        bundle_path: Have workers memory-map this model bundle instead of
+            loading the pickles
+        timings: Optional dictionary that collects seconds per stage, see
+            predict_batch_students; 'read' is added for reading the file.
+            With workers the scoring stages are summed over all workers
+        **predict_kwargs: Passed through to predict_batch_students
+    
+    Yields:
+        DataFrame with predictions for each chunk, in file order
+    """
+    chunks = iter_student_file(source, components['feature_info'], file_format, chunk_size, keep_columns)
+    chunks = _timed_chunks(chunks, timings, 'read')
+    
+    if n_workers is None or n_workers <= 1:
+        for chunk in chunks:
+            yield predict_batch_students(chunk, components, timings=timings, **predict_kwargs)
+        return
+    
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    
+    def collect(future):
+        results, shard_timings = future.result()
+        if timings is not None:
+            for stage, seconds in shard_timings.items():
+                timings[stage] = timings.get(stage, 0.0) + seconds
+        return results
+    
+    component_names = batch_component_names(predict_kwargs.get('models', 'both'), predict_kwargs.get('svm_mode', 'sklearn'))
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_prediction_worker,
+                             initargs=(1, bundle_path, component_names)) as executor:
+        # Futures are collected in submission order, which keeps the file order
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_predict_shard_timed, chunk, predict_kwargs))
+            if len(pending) >= 2 * n_workers:
+                yield collect(pending.popleft())
+        while pending:
+            yield collect(pending.popleft())
+
+def predict_batch_file(input_path, output_path, components, chunk_size=50000, keep_columns=None,
+                       input_format=None, output_format=None, n_workers=None, bundle_path=None,
+                       timings=None, **predict_kwargs):
+    """
+    Score a student file chunk by chunk and append the results to an output file
+    
+    Args:
+        input_path: Path or file-like object with CSV, Parquet or Arrow IPC student data
+        output_path: Path of the CSV, Parquet or Arrow IPC file to write
+        components: Dictionary with loaded models and preprocessors
+        chunk_size: Number of rows per chunk
+        keep_columns: Extra input columns (e.g. a student ID) to copy into the results
+        input_format, output_format: 'csv', 'parquet' or 'arrow' (default to the file extensions)
+        n_workers, bundle_path: Score in worker processes, see iter_batch_predictions
+        timings: Optional dictionary that collects seconds per stage, see
+            iter_batch_predictions; 'write' is added for writing the output
+        **predict_kwargs: Passed through to predict_batch_students
+    
+    Returns:
+        Number of rows scored
+    """
+    with ResultWriter(output_path, output_format) as writer:
+        for results in iter_batch_predictions(input_path, components, chunk_size, keep_columns, input_format,
+                                              n_workers, bundle_path, timings, **predict_kwargs):
+            start = time.perf_counter()
+            # Columnar formats keep the numeric confidences
+            writer.write(format_batch_results(results) if writer.file_format == 'csv' else results)
+            _record_timing(timings, 'write', start)
+    return writer.n_rows
+
 def get_risk_level(prediction):
     """
     Convert prediction to risk level
@@ -0,0 +1,340 @@
+"""
+Typed, column-pruned ingestion of student rosters
+
+The reader is driven by feature_info: it checks the header before reading
+the body, reads only the feature columns (plus any columns the caller asks
+to keep) and parses them straight into compact dtypes, categoricals as
+pandas Category and numerics as float32. Under the pyarrow engine the small
+whole-number features are read as nullable Int8 instead; the C parser's
+Int8 path is slower than its float32 one. A file with a missing column or
+an unparseable value fails with a ValueError before any scoring work is done.
+
+Parquet and Arrow IPC (Feather v2) files are read the same way, through
+pyarrow, which is imported only when one of those formats is used. Results
+can be written back as CSV, Parquet or Arrow IPC, one chunk at a time.
+"""
+import io
+import os
+
+import pandas as pd
+
+# Numeric features that only take small whole values
+INTEGER_FEATURES = ['age', 'exercise_frequency', 'mental_health_rating']
+
+# CSV parsers accepted by read_student_csv ('pyarrow' is multithreaded but cannot stream chunks)
+CSV_ENGINES = ('c', 'pyarrow')
+
+# Supported file formats by file extension
+FILE_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow'
+}
+
+def student_dtypes(feature_info, engine='c'):
+    """
+    Column dtypes for the feature columns
+
+    Args:
+        feature_info: Dictionary with feature information
+        engine: CSV parser the dtypes are for
+
+    Returns:
+        Dictionary of column name to dtype
+    """
+    dtypes = {col: 'category' for col in feature_info['categorical_columns']}
+    for col in feature_info['numerical_columns']:
+        dtypes[col] = 'Int8' if engine == 'pyarrow' and col in INTEGER_FEATURES else 'float32'
+    return dtypes
+
+def read_csv_header(source):
+    """
+    Read only the header row of a CSV
+
+    File-like sources are rewound afterwards so the body can be read next.
+
+    Returns:
+        List of column names
+    """
+    position = source.tell() if hasattr(source, 'seek') else None
+    columns = pd.read_csv(source, nrows=0).columns.tolist()
+    if position is not None:
+        source.seek(position)
+    return columns
+
+def check_student_columns(columns, feature_info):
+    """
+    Raise a ValueError naming the feature columns missing from a header
+    """
+    missing_columns = [col for col in feature_info['feature_columns'] if col not in columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+
+def read_student_csv(source, feature_info, engine='c', chunksize=None, keep_columns=None):
+    """
+    Read a student CSV with only the feature columns, in compact dtypes
+
+    Args:
+        source: Path or file-like object with student CSV data
+        feature_info: Dictionary with feature information
+        engine: CSV parser, 'c' or 'pyarrow'
+        chunksize: Return an iterator of DataFrames with this many rows
+            (only supported by the 'c' engine)
+        keep_columns: Extra columns (e.g. a student ID) to read as strings
+            and carry through to the results
+
+    Returns:
+        DataFrame, or an iterator of DataFrames when chunksize is given
+
+    Raises:
+        ValueError: If required columns are missing or a value can't be parsed
+    """
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine {engine!r}, expected one of {CSV_ENGINES}")
+    if chunksize is not None and engine != 'c':
+        raise ValueError("Chunked reading requires the 'c' CSV engine")
+
+    keep_columns = list(keep_columns or [])
+    columns = read_csv_header(source)
+    check_student_columns(columns, feature_info)
+    missing_keep = [col for col in keep_columns if col not in columns]
+    if missing_keep:
+        raise ValueError(f"Columns to keep not found: {missing_keep}")
+
+    dtypes = student_dtypes(feature_info, engine)
+    dtypes.update({col: str for col in keep_columns})
+    usecols = keep_columns + [col for col in feature_info['feature_columns'] if col not in keep_columns]
+
+    try:
+        data = pd.read_csv(source, usecols=usecols, dtype=dtypes, engine=engine, chunksize=chunksize)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Could not parse student data: {e}") from e
+
+    if chunksize is None:
+        return data[usecols]
+    return _checked_chunks(data, usecols)
+
+def _checked_chunks(reader, usecols):
+    # Parse errors in later chunks surface while iterating
+    with reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Could not parse student data: {e}") from e
+            yield chunk[usecols]
+
+def detect_format(source, file_format=None):
+    """
+    File format of a path or uploaded file: 'csv', 'parquet' or 'arrow'
+
+    Args:
+        source: Path or file-like object (its name is used if it has one)
+        file_format: Explicit format, which wins over the file extension
+
+    Raises:
+        ValueError: If the format is unknown or can't be told from the name
+    """
+    formats = sorted(set(FILE_FORMATS.values()))
+    if file_format is not None:
+        if file_format not in formats:
+            raise ValueError(f"Unknown file format {file_format!r}, expected one of {formats}")
+        return file_format
+
+    name = str(source) if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    extension = os.path.splitext(name)[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(f"Can't tell the file format of {name!r}, expected one of {formats}")
+    return FILE_FORMATS[extension]
+
+def read_columnar_schema(source, file_format):
+    """
+    Column names of a Parquet or Arrow IPC file, read from its footer or
+    schema message only
+    """
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    position = source.tell() if hasattr(source, 'seek') else None
+    try:
+        if file_format == 'parquet':
+            names = pyarrow.parquet.ParquetFile(source).schema_arrow.names
+        else:
+            names = pyarrow.ipc.open_file(source).schema.names
+    except pyarrow.ArrowException as e:
+        raise ValueError(f"Could not read {file_format} schema: {e}") from e
+    if position is not None:
+        source.seek(position)
+    return names
+
+def read_file_columns(source, file_format=None):
+    """
+    Column names of a CSV, Parquet or Arrow IPC file without reading its rows
+    """
+    file_format = detect_format(source, file_format)
+    if file_format == 'csv':
+        return read_csv_header(source)
+    return read_columnar_schema(source, file_format)
+
+def _student_columns(source, feature_info, file_format, keep_columns):
+    """
+    Validate the header and return the columns to read
+    """
+    columns = read_file_columns(source, file_format)
+    check_student_columns(columns, feature_info)
+
+    missing_keep = [col for col in keep_columns if col not in columns]
+    if missing_keep:
+        raise ValueError(f"Columns to keep not found: {missing_keep}")
+    return keep_columns + [col for col in feature_info['feature_columns'] if col not in keep_columns]
+
+def _table_to_students(table, feature_info, keep_columns):
+    """
+    Convert an Arrow table to a DataFrame with the same dtypes as read_student_csv
+    """
+    dtypes = student_dtypes(feature_info, 'pyarrow')
+    dtypes.update({col: str for col in keep_columns})
+    try:
+        return table.to_pandas().astype(dtypes)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Could not parse student data: {e}") from e
+
+def read_student_file(source, feature_info, file_format=None, keep_columns=None, engine='c'):
+    """
+    Read a CSV, Parquet or Arrow IPC student file with only the needed columns
+
+    Args:
+        source: Path or file-like object
+        feature_info: Dictionary with feature information
+        file_format: 'csv', 'parquet' or 'arrow' (defaults to the file extension)
+        keep_columns: Extra columns to read as strings and carry through
+        engine: CSV parser, see read_student_csv
+
+    Returns:
+        DataFrame with the same dtypes as read_student_csv
+
+    Raises:
+        ValueError: If required columns are missing or a value can't be parsed
+    """
+    file_format = detect_format(source, file_format)
+    if file_format == 'csv':
+        return read_student_csv(source, feature_info, engine=engine, keep_columns=keep_columns)
+
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    keep_columns = list(keep_columns or [])
+    usecols = _student_columns(source, feature_info, file_format, keep_columns)
+    if file_format == 'parquet':
+        table = pyarrow.parquet.read_table(source, columns=usecols)
+    else:
+        table = pyarrow.feather.read_table(source, columns=usecols, memory_map=isinstance(source, (str, os.PathLike)))
+    return _table_to_students(table.select(usecols), feature_info, keep_columns)
+
+def iter_student_file(source, feature_info, file_format=None, chunksize=50000, keep_columns=None):
+    """
+    Read a student file in chunks of at most chunksize rows
+
+    Parquet is streamed batch by batch; Arrow IPC files are memory-mapped
+    and sliced, so neither is loaded as a whole DataFrame.
+
+    Yields:
+        DataFrames with the same dtypes as read_student_csv
+    """
+    file_format = detect_format(source, file_format)
+    if file_format == 'csv':
+        yield from read_student_csv(source, feature_info, chunksize=chunksize, keep_columns=keep_columns)
+        return
+
+    import pyarrow
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    keep_columns = list(keep_columns or [])
+    usecols = _student_columns(source, feature_info, file_format, keep_columns)
+    if file_format == 'parquet':
+        for batch in pyarrow.parquet.ParquetFile(source).iter_batches(batch_size=chunksize, columns=usecols):
+            yield _table_to_students(pyarrow.Table.from_batches([batch]).select(usecols), feature_info, keep_columns)
+    else:
+        table = pyarrow.feather.read_table(source, columns=usecols, memory_map=isinstance(source, (str, os.PathLike)))
+        for offset in range(0, table.num_rows, chunksize):
+            yield _table_to_students(table.slice(offset, chunksize).select(usecols), feature_info, keep_columns)
+
+class ResultWriter:
+    """
+    Write result DataFrames to one CSV, Parquet or Arrow IPC file, chunk by chunk
+
+    The first chunk fixes the schema. An Arrow IPC file allows only one
+    dictionary per column, and category columns read from the input can
+    differ from chunk to chunk, so the Arrow writer stores category columns
+    as (zstd-compressed) strings; Parquet keeps them dictionary-encoded.
+
+    Args:
+        destination: Path or writable binary file-like object
+        file_format: 'csv', 'parquet' or 'arrow' (defaults to the file extension)
+    """
+
+    def __init__(self, destination, file_format=None):
+        self.destination = destination
+        self.file_format = detect_format(destination, file_format)
+        self.n_rows = 0
+        self._writer = None
+        self._schema = None
+        self._file = None
+
+    def write(self, results):
+        if self.file_format == 'csv':
+            if self._file is None:
+                self._file = open(self.destination, 'w', newline='') if isinstance(self.destination, (str, os.PathLike)) else self.destination
+            text = results.to_csv(index=False, header=(self.n_rows == 0))
+            self._file.write(text if isinstance(self._file, io.TextIOBase) else text.encode('utf-8'))
+        else:
+            self._write_table(results)
+        self.n_rows += len(results)
+
+    def _write_table(self, results):
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        table = pyarrow.Table.from_pandas(results, preserve_index=False)
+        if self._writer is None:
+            schema = table.schema
+            if self.file_format == 'arrow':
+                for i, field in enumerate(schema):
+                    if pyarrow.types.is_dictionary(field.type):
+                        schema = schema.set(i, field.with_type(field.type.value_type))
+                options = pyarrow.ipc.IpcWriteOptions(compression='zstd')
+                self._writer = pyarrow.ipc.new_file(self.destination, schema, options=options)
+            else:
+                self._writer = pyarrow.parquet.ParquetWriter(self.destination, schema, compression='zstd')
+            self._schema = schema
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None and self._file is not self.destination:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_results(results, destination, file_format=None):
+    """
+    Write one result DataFrame as CSV, Parquet or Arrow IPC
+
+    Returns:
+        Number of rows written
+    """
+    with ResultWriter(destination, file_format) as writer:
+        writer.write(results)
+    return writer.n_rows
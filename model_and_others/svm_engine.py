@@ -0,0 +1,355 @@
+"""
+Single-pass scoring engine for the RBF SVM
+
+SVC.predict and SVC.predict_proba each evaluate the kernel against every
+support vector. This engine evaluates the kernel once, turns it into the
+one-vs-one decision values with a single matmul, and derives the label, the
+Platt-calibrated probabilities and the confidence from those values using
+the same rules as libsvm.
+
+Label policy:
+    SVC.predict uses one-vs-one voting while SVC.predict_proba couples the
+    Platt-scaled pairwise probabilities, so for rows close to a decision
+    boundary the voted label can differ from the argmax of the probabilities.
+    With label_policy='predict' (the default) the label is the voted one,
+    exactly as SVC.predict returns it. With label_policy='proba' the label is
+    the argmax of the probabilities. In both cases the confidence is the
+    largest class probability, as in the rest of the prediction functions.
+
+Blocking:
+    Rows are scored in blocks so that only one (block_size x n_support_vectors)
+    kernel buffer is alive at a time, whatever the batch size. Kernels use
+    ||x||^2 + ||sv||^2 - 2 x.sv so the heavy lifting is a single BLAS matmul per
+    block. With float32=True the kernel is computed in single precision; the
+    Platt calibration always runs in double precision.
+
+Approximation:
+    fit_svm_approximation replaces the support vectors with a smaller set of
+    landmarks (a Nystroem approximation of the trained kernel machine). The
+    result is an engine of the same shape, so it is scored by the same code;
+    cost per row scales with n_components instead of the number of support
+    vectors. Its fidelity report compares it against the exact engine.
+"""
+import time
+
+import numpy as np
+
+# libsvm clips pairwise probabilities to [MIN_PROB, 1 - MIN_PROB]
+MIN_PROB = 1e-7
+
+# Target size of one kernel block, small enough to stay in L2/L3 cache
+KERNEL_BLOCK_BYTES = 2 * 1024 * 1024
+
+def check_svm_engine_support(svm_model):
+    """
+    Check that compile_svm_engine can handle a model, without compiling it
+
+    Raises:
+        ValueError: If the model is not an RBF SVC trained with probability=True
+    """
+    if svm_model.kernel != 'rbf':
+        raise ValueError(f"Only the RBF kernel is supported, got {svm_model.kernel!r}")
+    if not getattr(svm_model, 'probability', False):
+        raise ValueError("SVM must be trained with probability=True")
+
+def compile_svm_engine(svm_model):
+    """
+    Extract everything needed to score an RBF SVC from its fitted attributes
+
+    Args:
+        svm_model: Fitted sklearn SVC with kernel='rbf' and probability=True
+
+    Returns:
+        Dictionary with support vectors, pairwise weights and Platt parameters
+
+    Raises:
+        ValueError: If the model is not supported, see check_svm_engine_support
+    """
+    check_svm_engine_support(svm_model)
+
+    n_classes = len(svm_model.classes_)
+    support_vectors = np.asarray(svm_model.support_vectors_, dtype=np.float64)
+    dual_coef = np.asarray(svm_model.dual_coef_, dtype=np.float64)
+    intercept = np.asarray(svm_model.intercept_, dtype=np.float64)
+
+    # sklearn flips the sign of the binary problem; undo it to get libsvm's values
+    if n_classes == 2:
+        dual_coef = -dual_coef
+        intercept = -intercept
+
+    # One column per (i, j) pair in libsvm order, so decision values are K @ pair_weights
+    starts = np.concatenate([[0], np.cumsum(svm_model.n_support_)])
+    pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+    pair_weights = np.zeros((support_vectors.shape[0], len(pairs)))
+    for p, (i, j) in enumerate(pairs):
+        si = slice(starts[i], starts[i + 1])
+        sj = slice(starts[j], starts[j + 1])
+        pair_weights[si, p] = dual_coef[j - 1, si]
+        pair_weights[sj, p] = dual_coef[i, sj]
+
+    # gamma='scale'/'auto' is resolved at fit time and only kept in _gamma
+    gamma = getattr(svm_model, '_gamma', svm_model.gamma)
+
+    return {
+        'classes': np.asarray(svm_model.classes_),
+        'support_vectors': support_vectors,
+        'pair_weights': pair_weights,
+        'kernel_arrays': _kernel_arrays(support_vectors, pair_weights),
+        'intercept': intercept,
+        'pairs': np.asarray(pairs),
+        'prob_a': np.asarray(svm_model.probA_, dtype=np.float64),
+        'prob_b': np.asarray(svm_model.probB_, dtype=np.float64),
+        'gamma': float(gamma)
+    }
+
+def _kernel_arrays(support_vectors, pair_weights):
+    """
+    Support vector norms and weights for each kernel precision
+    """
+    kernel_arrays = {}
+    for dtype in (np.float64, np.float32):
+        sv = np.ascontiguousarray(support_vectors, dtype=dtype)
+        kernel_arrays[dtype] = {
+            'support_vectors_t': np.ascontiguousarray(sv.T),
+            'sv_sq_norms': np.einsum('ij,ij->i', sv, sv),
+            'pair_weights': np.ascontiguousarray(pair_weights, dtype=dtype)
+        }
+    return kernel_arrays
+
+def default_block_size(engine, float32=False):
+    """
+    Number of rows whose kernel block fits in KERNEL_BLOCK_BYTES
+    """
+    itemsize = 4 if float32 else 8
+    n_support = engine['support_vectors'].shape[0]
+    return max(64, KERNEL_BLOCK_BYTES // (itemsize * max(n_support, 1)))
+
+def svm_decision_values(engine, X, float32=False, kernel_buffer=None):
+    """
+    One-vs-one decision values, one column per class pair in libsvm order
+
+    Args:
+        engine: Dictionary from compile_svm_engine
+        X: 2-D array of scaled features (one block of rows)
+        float32: Compute the kernel in single precision
+        kernel_buffer: Optional preallocated array of at least
+            (len(X), n_support_vectors) in the kernel precision
+
+    Returns:
+        Array of shape (n_rows, n_pairs) in double precision
+    """
+    dtype = np.float32 if float32 else np.float64
+    arrays = engine['kernel_arrays'][dtype]
+    X = np.asarray(X, dtype=dtype)
+    n_rows = X.shape[0]
+
+    if kernel_buffer is None:
+        kernel = np.empty((n_rows, arrays['support_vectors_t'].shape[1]), dtype=dtype)
+    else:
+        kernel = kernel_buffer[:n_rows]
+
+    # exp(-gamma * (||x||^2 + ||sv||^2 - 2 x.sv)), built in place
+    np.matmul(X, arrays['support_vectors_t'], out=kernel)
+    kernel *= -2.0
+    kernel += np.einsum('ij,ij->i', X, X)[:, None]
+    kernel += arrays['sv_sq_norms']
+    np.maximum(kernel, 0.0, out=kernel)
+    kernel *= -engine['gamma']
+    np.exp(kernel, out=kernel)
+
+    decision_values = kernel @ arrays['pair_weights']
+    return decision_values.astype(np.float64, copy=False) + engine['intercept']
+
+def votes_from_decision_values(engine, decision_values):
+    """
+    Class indices chosen by one-vs-one voting (ties go to the lowest index)
+    """
+    n_rows = decision_values.shape[0]
+    votes = np.zeros((n_rows, len(engine['classes'])), dtype=np.int64)
+    positive = decision_values > 0
+
+    for p, (i, j) in enumerate(engine['pairs']):
+        votes[:, i] += positive[:, p]
+        votes[:, j] += ~positive[:, p]
+
+    return np.argmax(votes, axis=1)
+
+def proba_from_decision_values(engine, decision_values):
+    """
+    Platt-calibrated class probabilities from one-vs-one decision values
+    """
+    n_rows = decision_values.shape[0]
+    n_classes = len(engine['classes'])
+
+    # Pairwise probabilities: pairwise[:, i, j] = P(class i | class i or j)
+    pairwise_ij = 1.0 / (1.0 + np.exp(decision_values * engine['prob_a'] + engine['prob_b']))
+    pairwise_ij = np.clip(pairwise_ij, MIN_PROB, 1.0 - MIN_PROB)
+    pairwise = np.zeros((n_rows, n_classes, n_classes))
+    for p, (i, j) in enumerate(engine['pairs']):
+        pairwise[:, i, j] = pairwise_ij[:, p]
+        pairwise[:, j, i] = 1.0 - pairwise_ij[:, p]
+
+    # sklearn's libsvm couples even two classes (stopping at its tolerance) rather than
+    # returning the pairwise probability as-is
+    return _couple_pairwise_probabilities(pairwise)
+
+def _couple_pairwise_probabilities(pairwise):
+    """
+    Vectorized port of libsvm's multiclass_probability (Wu, Lin and Weng, 2004)
+
+    Rows stop updating as soon as they converge, so each row follows exactly
+    the same iterations it would in libsvm.
+    """
+    n_rows, n_classes, _ = pairwise.shape
+
+    # Q[t, t] = sum_{j != t} r[j, t]^2 and Q[t, j] = -r[j, t] * r[t, j]
+    transposed = np.transpose(pairwise, (0, 2, 1))
+    Q = -transposed * pairwise
+    diagonal = np.sum(transposed ** 2, axis=2) - np.einsum('nii->ni', transposed) ** 2
+    idx = np.arange(n_classes)
+    Q[:, idx, idx] = diagonal
+
+    p = np.full((n_rows, n_classes), 1.0 / n_classes)
+    Qp = np.einsum('ntj,nj->nt', Q, p)
+    pQp = np.sum(p * Qp, axis=1)
+
+    max_iter = max(100, n_classes)
+    eps = 0.005 / n_classes
+    active = np.ones(n_rows, dtype=bool)
+
+    for _ in range(max_iter):
+        max_error = np.max(np.abs(Qp - pQp[:, None]), axis=1)
+        active &= max_error >= eps
+        if not active.any():
+            break
+
+        rows = np.flatnonzero(active)
+        p_a, Qp_a, pQp_a, Q_a = p[rows], Qp[rows], pQp[rows], Q[rows]
+        for t in range(n_classes):
+            q_tt = Q_a[:, t, t]
+            diff = (-Qp_a[:, t] + pQp_a) / q_tt
+            p_a[:, t] += diff
+            pQp_a = (pQp_a + diff * (diff * q_tt + 2 * Qp_a[:, t])) / (1 + diff) / (1 + diff)
+            Qp_a = (Qp_a + diff[:, None] * Q_a[:, t, :]) / (1 + diff)[:, None]
+            p_a /= (1 + diff)[:, None]
+        p[rows], Qp[rows], pQp[rows] = p_a, Qp_a, pQp_a
+
+    return p
+
+def svm_engine_predict(engine, X, label_policy='predict', block_size=None, float32=False):
+    """
+    Labels and probabilities from a single kernel evaluation
+
+    Args:
+        engine: Dictionary from compile_svm_engine
+        X: 2-D array of scaled features
+        label_policy: 'predict' to match SVC.predict, 'proba' for argmax of the
+            probabilities (see the module docstring)
+        block_size: Rows per kernel block (defaults to default_block_size)
+        float32: Compute the kernel in single precision
+
+    Returns:
+        Tuple (labels, probabilities) where labels are values of SVC.classes_
+    """
+    if label_policy not in ('predict', 'proba'):
+        raise ValueError(f"Unknown label_policy: {label_policy!r}")
+
+    X = np.asarray(X)
+    n_rows = X.shape[0]
+    if block_size is None:
+        block_size = default_block_size(engine, float32)
+
+    label_index = np.empty(n_rows, dtype=np.int64)
+    proba = np.empty((n_rows, len(engine['classes'])))
+    kernel_buffer = np.empty((min(block_size, n_rows), engine['support_vectors'].shape[0]),
+                             dtype=np.float32 if float32 else np.float64)
+
+    for start in range(0, n_rows, block_size):
+        block = slice(start, min(start + block_size, n_rows))
+        decision_values = svm_decision_values(engine, X[block], float32, kernel_buffer)
+        proba[block] = proba_from_decision_values(engine, decision_values)
+
+        if label_policy == 'predict':
+            label_index[block] = votes_from_decision_values(engine, decision_values)
+        else:
+            label_index[block] = np.argmax(proba[block], axis=1)
+
+    return engine['classes'][label_index], proba
+
+def rbf_kernel_matrix(engine, A, B):
+    """
+    Dense RBF kernel between two small matrices with the engine's gamma
+    """
+    sq_dist = np.sum(A ** 2, axis=1)[:, None] + np.sum(B ** 2, axis=1)[None, :] - 2.0 * A @ B.T
+    return np.exp(-engine['gamma'] * np.maximum(sq_dist, 0.0))
+
+def fit_svm_approximation(engine, X_holdout, n_components=64, random_state=0):
+    """
+    Fit a Nystroem approximation of the exact SVM engine
+
+    Each decision function sum_i alpha_i K(x, sv_i) is projected onto the span
+    of K(x, l_j) for a subset of landmark support vectors, giving weights
+    pinv(K_LL) K_LS alpha. Landmarks are sampled with probability proportional
+    to the magnitude of their dual coefficients.
+
+    Args:
+        engine: Exact engine from compile_svm_engine
+        X_holdout: Scaled student rows for the fidelity report
+        n_components: Number of landmarks; the accuracy/speed knob
+        random_state: Seed for landmark sampling
+
+    Returns:
+        Engine dictionary usable with svm_engine_predict, with a 'fidelity' report
+    """
+    rng = np.random.RandomState(random_state)
+    support_vectors = engine['support_vectors']
+    n_support = support_vectors.shape[0]
+    n_components = min(int(n_components), n_support)
+
+    weight = np.abs(engine['pair_weights']).sum(axis=1)
+    landmark_idx = np.sort(rng.choice(n_support, size=n_components, replace=False, p=weight / weight.sum()))
+    landmarks = support_vectors[landmark_idx]
+
+    K_LL = rbf_kernel_matrix(engine, landmarks, landmarks)
+    K_LS = rbf_kernel_matrix(engine, landmarks, support_vectors)
+    pair_weights = np.linalg.pinv(K_LL, hermitian=True) @ K_LS @ engine['pair_weights']
+
+    approx = dict(engine)
+    approx.update({
+        'support_vectors': landmarks,
+        'pair_weights': pair_weights,
+        'kernel_arrays': _kernel_arrays(landmarks, pair_weights),
+        'n_components': n_components
+    })
+
+    approx['fidelity'] = svm_fidelity_report(engine, approx, X_holdout)
+
+    return approx
+
+def svm_fidelity_report(exact_engine, approx_engine, X_holdout):
+    """
+    Compare an approximate engine against the exact one on holdout rows
+
+    Returns:
+        Dictionary with label agreement, probability differences and timings
+    """
+    start = time.perf_counter()
+    exact_labels, exact_proba = svm_engine_predict(exact_engine, X_holdout)
+    exact_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    approx_labels, approx_proba = svm_engine_predict(approx_engine, X_holdout)
+    approx_seconds = time.perf_counter() - start
+
+    proba_diff = np.abs(exact_proba - approx_proba)
+
+    return {
+        'holdout_rows': int(len(X_holdout)),
+        'exact_support_vectors': int(exact_engine['support_vectors'].shape[0]),
+        'approx_support_vectors': int(approx_engine['support_vectors'].shape[0]),
+        'label_agreement': float(np.mean(exact_labels == approx_labels)),
+        'max_abs_proba_diff': float(proba_diff.max()),
+        'mean_abs_proba_diff': float(proba_diff.mean()),
+        'exact_seconds': exact_seconds,
+        'approx_seconds': approx_seconds
+    }
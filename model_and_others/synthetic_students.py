@@ -0,0 +1,201 @@
+"""
+Seeded synthetic students for training data, fixtures and load tests
+
+Feature ranges come from feature_descriptions.json: "(17-24 years)" is a
+range (whole numbers for INTEGER_FEATURES, uniform floats otherwise) and
+"(Male/Female)" a list of choices. Every column is drawn with one vectorized
+numpy call, so generating millions of rows takes seconds.
+
+Draws come from a legacy np.random.RandomState in a fixed order (the
+features in file order, then the exam score noise), which reproduces the
+data fix_models.py has always trained on for the same seed and sample size.
+write_students streams chunks from one generator to CSV, Parquet or Arrow
+IPC, so the file size is not limited by memory; the same seed and chunk
+size always give the same file. CSV is written with pyarrow's CSV writer,
+several times faster than DataFrame.to_csv; generated values never need
+quoting, and they read back the same (whole floats just lose their ".0").
+"""
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from student_io import INTEGER_FEATURES, ResultWriter, detect_format
+
+DESCRIPTIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feature_descriptions.json')
+
+# Yes/No flags are drawn in the order fix_models.py always used, so seeded data stays the same
+BINARY_CHOICES = ['No', 'Yes']
+
+# Exam score bins for the performance categories
+PERFORMANCE_BINS = [0, 60, 80, 100]
+PERFORMANCE_LABELS = ['Poor', 'Average', 'Good']
+
+_RANGE_PATTERN = re.compile(r'\((\d+(?:\.\d+)?)-(\d+(?:\.\d+)?)')
+_CHOICES_PATTERN = re.compile(r'\(([^()]+/[^()]+)\)')
+
+def load_feature_ranges(path=DESCRIPTIONS_PATH):
+    """
+    Parse the value range of each feature from its description
+
+    Args:
+        path: feature_descriptions.json to read
+
+    Returns:
+        Dictionary of column name to {'type': 'int' or 'float', 'low', 'high'}
+        (high inclusive for 'int') or {'type': 'choice', 'choices': [...]},
+        in file order
+
+    Raises:
+        ValueError: If a description has neither a range nor choices
+    """
+    with open(path) as f:
+        descriptions = json.load(f)
+
+    ranges = {}
+    for col, description in descriptions.items():
+        match = _RANGE_PATTERN.search(description)
+        if match:
+            if col in INTEGER_FEATURES:
+                ranges[col] = {'type': 'int', 'low': int(float(match.group(1))), 'high': int(float(match.group(2)))}
+            else:
+                ranges[col] = {'type': 'float', 'low': float(match.group(1)), 'high': float(match.group(2))}
+            continue
+
+        match = _CHOICES_PATTERN.search(description)
+        if not match:
+            raise ValueError(f"No range or choices in the description of {col!r}: {description!r}")
+        choices = [choice.strip() for choice in match.group(1).split('/')]
+        if sorted(choices) == BINARY_CHOICES:
+            choices = list(BINARY_CHOICES)
+        ranges[col] = {'type': 'choice', 'choices': choices}
+    return ranges
+
+def exam_scores(data, rng):
+    """
+    Synthetic exam scores from study habits plus normal noise, clamped to 18.4-100
+
+    Args:
+        data: DataFrame or dictionary with the feature columns
+        rng: np.random.RandomState the noise is drawn from
+
+    Returns:
+        float64 array of exam scores
+    """
+    study_hours = np.asarray(data['study_hours_per_day'])
+    scores = (70
+              + study_hours * 3
+              - np.asarray(data['social_media_hours']) * 2
+              + (np.asarray(data['attendance_percentage']) - 70) * 0.3
+              + np.asarray(data['mental_health_rating']) * 1.5
+              + rng.normal(0, 10, len(study_hours)))
+    return np.clip(scores, 18.4, 100.0)
+
+def generate_students(n_samples, random_state=42, feature_ranges=None, with_target=False,
+                      categorical=False, decimals=None):
+    """
+    Generate synthetic students with vectorized draws
+
+    Args:
+        n_samples: Number of students
+        random_state: Seed or np.random.RandomState to draw from
+        feature_ranges: Output of load_feature_ranges (read from disk if None)
+        with_target: Add the exam_score and performance_category columns
+        categorical: Return choice columns as pandas Category instead of strings
+        decimals: Round the float features to this many decimals
+
+    Returns:
+        DataFrame with the feature columns in feature_descriptions.json order
+    """
+    rng = random_state if isinstance(random_state, np.random.RandomState) else np.random.RandomState(random_state)
+    if feature_ranges is None:
+        feature_ranges = load_feature_ranges()
+
+    data = {}
+    for col, spec in feature_ranges.items():
+        if spec['type'] == 'int':
+            data[col] = rng.randint(spec['low'], spec['high'] + 1, n_samples)
+        elif spec['type'] == 'float':
+            values = rng.uniform(spec['low'], spec['high'], n_samples)
+            data[col] = values.round(decimals) if decimals is not None else values
+        else:
+            # Same draws as rng.choice(choices, n_samples), without building a string array first
+            codes = rng.randint(0, len(spec['choices']), n_samples)
+            if categorical:
+                data[col] = pd.Categorical.from_codes(codes, categories=spec['choices'])
+            else:
+                data[col] = np.array(spec['choices'], dtype=object)[codes]
+
+    df = pd.DataFrame(data)
+    if with_target:
+        df['exam_score'] = exam_scores(data, rng)
+        df['performance_category'] = pd.cut(df['exam_score'], bins=PERFORMANCE_BINS,
+                                            labels=PERFORMANCE_LABELS, include_lowest=True)
+    return df
+
+def iter_students(n_samples, chunk_size=1000000, random_state=42, **generate_kwargs):
+    """
+    Generate n_samples students as chunks of at most chunk_size rows
+
+    All chunks are drawn from one generator, so the stream is reproducible
+    for a given seed and chunk size.
+
+    Yields:
+        DataFrames from generate_students
+    """
+    rng = random_state if isinstance(random_state, np.random.RandomState) else np.random.RandomState(random_state)
+    if generate_kwargs.get('feature_ranges') is None:
+        generate_kwargs['feature_ranges'] = load_feature_ranges()
+    for offset in range(0, n_samples, chunk_size):
+        yield generate_students(min(chunk_size, n_samples - offset), rng, **generate_kwargs)
+
+def write_students(destination, n_samples, chunk_size=1000000, random_state=42, file_format=None,
+                   **generate_kwargs):
+    """
+    Stream synthetic students to a CSV, Parquet or Arrow IPC file
+
+    Args:
+        destination: Path or writable binary file-like object
+        n_samples: Number of students
+        chunk_size: Rows generated and written at a time
+        random_state: Seed for the generator
+        file_format: 'csv', 'parquet' or 'arrow' (defaults to the file extension)
+        **generate_kwargs: Passed through to generate_students
+
+    Returns:
+        Number of rows written
+    """
+    chunks = iter_students(n_samples, chunk_size, random_state, **generate_kwargs)
+    if detect_format(destination, file_format) == 'csv':
+        return _write_csv(destination, chunks)
+
+    with ResultWriter(destination, file_format) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.n_rows
+
+def _write_csv(destination, chunks):
+    import pyarrow
+    import pyarrow.csv
+
+    f = open(destination, 'wb') if isinstance(destination, (str, os.PathLike)) else destination
+    writer = None
+    n_rows = 0
+    try:
+        for chunk in chunks:
+            table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                # pyarrow quotes header names regardless of quoting_style; write a plain one like to_csv
+                f.write((','.join(table.column_names) + '\n').encode('utf-8'))
+                options = pyarrow.csv.WriteOptions(include_header=False, quoting_style='none')
+                writer = pyarrow.csv.CSVWriter(f, table.schema, write_options=options)
+            writer.write_table(table)
+            n_rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+        if f is not destination:
+            f.close()
+    return n_rows
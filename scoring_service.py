@@ -0,0 +1,347 @@
+"""
+Local HTTP scoring service for the student information system
+
+Usage:
+    python scoring_service.py serve [--host 127.0.0.1] [--port 8000] [--workers 4] [--bundle PATH] [--micro-batch]
+    python scoring_service.py loadtest [--url http://127.0.0.1:8000] [--requests 5000] [--concurrency 16]
+
+Endpoints:
+    POST /predict        one student as a JSON object -> prediction result
+    POST /predict_batch  {"students": [...]} -> {"predictions": [...]}
+    GET  /health         status, model version and fingerprint of this worker
+
+The listening socket is opened once and shared by --workers forked worker
+processes (the kernel spreads connections between them); each worker loads
+the models once through load_all_models and serves requests on threads.
+Results use the same dictionaries as predict_single_student. With
+--micro-batch, concurrent /predict requests in a worker are scored together
+by a MicroBatcher (see micro_batching.py).
+"""
+import argparse
+import json
+import math
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_and_others'))
+from prediction_functions import load_all_models, predict_single_student, predict_students
+
+# Largest accepted request body (a batch of roughly 50k students)
+MAX_BODY_BYTES = 32 * 2**20
+
+# Prediction options used by both endpoints (the pandas-free engine path)
+PREDICT_OPTIONS = {'svm_mode': 'single_pass'}
+
+def to_json(value):
+    """
+    Encode a result, converting numpy scalars to plain Python values
+
+    Raises:
+        ValueError: If the value contains NaN or infinity, which JSON can't represent
+    """
+    return json.dumps(value, default=lambda o: o.item() if hasattr(o, 'item') else str(o),
+                      allow_nan=False).encode('utf-8')
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """
+    JSON request handler; the worker's components live on the server object
+    """
+    # Keep-alive, so clients can reuse connections
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY the body waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        try:
+            body = to_json(payload)
+        except ValueError as e:
+            status, body = 500, to_json({'error': f"Could not encode response: {e}"})
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length < 0:
+            raise ValueError(f"Invalid Content-Length {length}")
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"Request body over {MAX_BODY_BYTES} bytes")
+        try:
+            return json.loads(self.rfile.read(length) or b'null')
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+
+    def check_students(self, students):
+        feature_info = self.server.components['feature_info']
+        tables = self.server.components['encoding_tables']
+        for i, student in enumerate(students):
+            if not isinstance(student, dict):
+                raise ValueError(f"Student {i} is not a JSON object")
+            missing = [col for col in feature_info['feature_columns'] if col not in student]
+            if missing:
+                raise ValueError(f"Student {i} is missing required fields: {missing}")
+            # json.loads accepts NaN and Infinity, and null would score as NaN
+            invalid = [col for col in feature_info['numerical_columns']
+                       if isinstance(student[col], bool) or not isinstance(student[col], (int, float))
+                       or not math.isfinite(student[col])]
+            if invalid:
+                raise ValueError(f"Student {i} has non-numeric or non-finite values in: {invalid}")
+            # Anything else would fail the encoder lookup with a 500 (and sink a whole micro-batch)
+            invalid = [col for col in feature_info['categorical_columns']
+                       if not isinstance(student[col], str)
+                       or (col in tables and student[col] not in tables[col]['codes'])]
+            if invalid:
+                raise ValueError(f"Student {i} has non-string or unknown categorical values in: {invalid}")
+
+    def do_GET(self):
+        if self.path != '/health':
+            self.send_json(404, {'error': f"Unknown endpoint {self.path}"})
+            return
+        components = self.server.components
+        health = {
+            'status': 'ok',
+            'model_version': components['metadata'].get('project_info', {}).get('version'),
+            'model_fingerprint': components.get('model_fingerprint'),
+            'worker_pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self.server.started_at, 1),
+            'requests_served': self.server.requests_served
+        }
+        if self.server.batcher is not None:
+            health['micro_batching'] = self.server.batcher.stats()
+        self.send_json(200, health)
+
+    def do_POST(self):
+        try:
+            payload = self.read_json()
+            if self.path == '/predict':
+                self.check_students([payload])
+                if self.server.batcher is not None:
+                    result = self.server.batcher.submit(payload).result()
+                else:
+                    result = predict_single_student(payload, self.server.components, use_linear_engine=True, **PREDICT_OPTIONS)
+            elif self.path == '/predict_batch':
+                students = payload.get('students') if isinstance(payload, dict) else None
+                if not isinstance(students, list):
+                    raise ValueError('Expected {"students": [...]}')
+                self.check_students(students)
+                predictions = predict_students(students, self.server.components, **PREDICT_OPTIONS) if students else []
+                result = {'predictions': predictions}
+            else:
+                self.send_json(404, {'error': f"Unknown endpoint {self.path}"})
+                return
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self.send_json(500, {'error': f"Prediction failed: {e}"})
+            return
+
+        self.server.requests_served += 1
+        self.send_json(200, result)
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for connection bursts from the load test and SIS batch jobs
+    request_queue_size = 1024
+
+    def __init__(self, address, access_log=False):
+        super().__init__(address, ScoringHandler)
+        self.access_log = access_log
+        self.components = None
+        self.batcher = None
+        self.started_at = time.time()
+        self.requests_served = 0
+
+def run_worker(server, bundle_path, micro_batch=False):
+    """
+    Load the models in this process and serve until terminated
+    """
+    components = load_all_models(bundle_path=bundle_path)
+    if components is None:
+        raise RuntimeError("Failed to load models")
+    server.components = components
+    if micro_batch:
+        from micro_batching import MicroBatcher
+        server.batcher = MicroBatcher(components, **PREDICT_OPTIONS).start_in_thread()
+    server.started_at = time.time()
+    server.serve_forever()
+
+def serve(host, port, n_workers, bundle_path=None, access_log=False, micro_batch=False):
+    """
+    Bind once, then serve from n_workers forked processes (or this process)
+    """
+    server = ScoringServer((host, port), access_log)
+    print(f"🚀 Scoring service on http://{host}:{server.server_address[1]} with {n_workers} worker(s)")
+
+    # Forking needs os.fork (Linux, macOS); elsewhere serve from this process
+    if n_workers <= 1 or not hasattr(os, 'fork'):
+        try:
+            run_worker(server, bundle_path, micro_batch)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    children = set()
+    for _ in range(n_workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            status = 1
+            try:
+                run_worker(server, bundle_path, micro_batch)
+                status = 0
+            except Exception:
+                traceback.print_exc()
+            finally:
+                sys.stderr.flush()
+                os._exit(status)
+        children.add(pid)
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+
+    # A worker that fails (e.g. can't load the models) takes the whole service down
+    exit_code = 0
+    while children:
+        try:
+            pid, status = os.waitpid(-1, 0)
+        except KeyboardInterrupt:
+            stop(None, None)
+            continue
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        code = os.waitstatus_to_exitcode(status)
+        if code > 0 and exit_code == 0:
+            print(f"❌ Worker {pid} exited with status {code}, stopping the service")
+            exit_code = 1
+            stop(None, None)
+    server.server_close()
+    return exit_code
+
+def load_test(url, n_requests, concurrency, endpoint='/predict', batch_size=1):
+    """
+    Send n_requests from concurrency keep-alive connections and time each one
+
+    Returns:
+        Dictionary with throughput (requests and students per second),
+        latency percentiles in milliseconds and the error count
+    """
+    import http.client
+    from urllib.parse import urlsplit
+
+    import numpy as np
+    from model_registry import SMOKE_TEST_STUDENT
+
+    target = urlsplit(url)
+    if endpoint == '/predict':
+        body = json.dumps(SMOKE_TEST_STUDENT).encode('utf-8')
+    else:
+        body = json.dumps({'students': [SMOKE_TEST_STUDENT] * batch_size}).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
+
+    latencies = []
+    errors = [0]
+    counter = iter(range(n_requests))
+    lock = threading.Lock()
+
+    def client():
+        connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    break
+            start = time.perf_counter()
+            try:
+                connection.request('POST', endpoint, body, headers)
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                ok = False
+                connection.close()
+                connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors[0] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'seconds': wall,
+        'requests_per_second': len(latencies) / wall,
+        'students_per_second': len(latencies) * (1 if endpoint == '/predict' else batch_size) / wall,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p90_ms': float(np.percentile(latencies_ms, 90)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'max_ms': float(latencies_ms.max())
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP scoring service for academic performance predictions")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help="Run the scoring service")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    serve_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    serve_parser.add_argument('--bundle', help="Load the models from this model bundle instead of the pickles")
+    serve_parser.add_argument('--access-log', action='store_true', help="Log every request")
+    serve_parser.add_argument('--micro-batch', action='store_true',
+                              help="Score concurrent /predict requests together in micro-batches")
+
+    load_parser = subparsers.add_parser('loadtest', help="Measure throughput and latency of a running service")
+    load_parser.add_argument('--url', default='http://127.0.0.1:8000')
+    load_parser.add_argument('--requests', type=int, default=5000, help="Total requests to send")
+    load_parser.add_argument('--concurrency', type=int, default=16, help="Concurrent connections")
+    load_parser.add_argument('--endpoint', default='/predict', choices=['/predict', '/predict_batch'])
+    load_parser.add_argument('--batch-size', type=int, default=100, help="Students per /predict_batch request")
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        return serve(args.host, args.port, args.workers, args.bundle, args.access_log, args.micro_batch)
+
+    report = load_test(args.url, args.requests, args.concurrency, args.endpoint, args.batch_size)
+    print(f"📊 {report['requests']} requests to {args.endpoint} in {report['seconds']:.1f}s "
+          f"with {args.concurrency} connections")
+    print(f"  Throughput: {report['requests_per_second']:,.0f} requests/sec "
+          f"({report['students_per_second']:,.0f} students/sec)")
+    print(f"  Latency:    p50 {report['p50_ms']:.1f} ms, p90 {report['p90_ms']:.1f} ms, "
+          f"p99 {report['p99_ms']:.1f} ms, max {report['max_ms']:.1f} ms")
+    if report['errors']:
+        print(f"❌ {report['errors']} requests failed")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
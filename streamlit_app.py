@@ -1,10 +1,5 @@
 # Academic Performance Prediction System - Streamlit App
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import json
 import sys
 import os
@@ -12,14 +7,10 @@ import os
 # Add the model_and_others directory to the path
 sys.path.append('model_and_others')
 
-# Import prediction functions
-from prediction_functions import (
-    load_all_models, 
-    predict_single_student, 
-    predict_batch_students,
-    validate_input_data,
-    get_feature_importance
-)
+# pandas and the prediction modules are imported by the pages that use them,
+# so Home/About render without paying for them (see diagnostics.py)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Page configuration
 st.set_page_config(
@@ -30,320 +21,26 @@ st.set_page_config(
 )
 
 # Beautiful Dark Mode CSS
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-    
-    /* Dark Theme Global Styles */
-    .main {
-        padding-top: 2rem;
-        background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%);
-        min-height: 100vh;
-        color: #f1f5f9;
-    }
-    
-    .stApp {
-        background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%);
-    }
-    
-    /* Override Streamlit's default text colors */
-    .stMarkdown, .stMarkdown p, .stMarkdown span, .stMarkdown div {
-        color: #e2e8f0 !important;
-    }
-    
-    /* Headers with Glow Effect */
-    .main-header {
-        font-family: 'Inter', sans-serif;
-        font-size: 3.5rem;
-        font-weight: 800;
-        background: linear-gradient(135deg, #60a5fa 0%, #a78bfa 50%, #f472b6 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        text-align: center;
-        margin-bottom: 2rem;
-        text-shadow: 0 0 30px rgba(96, 165, 250, 0.5);
-        animation: glow 2s ease-in-out infinite alternate;
-    }
-    
-    @keyframes glow {
-        from { filter: drop-shadow(0 0 10px rgba(96, 165, 250, 0.5)); }
-        to { filter: drop-shadow(0 0 20px rgba(167, 139, 250, 0.8)); }
-    }
-    
-    .sub-header {
-        font-family: 'Inter', sans-serif;
-        font-size: 2rem;
-        font-weight: 700;
-        color: #f1f5f9;
-        margin-bottom: 1.5rem;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-        border-bottom: 2px solid rgba(96, 165, 250, 0.3);
-        padding-bottom: 0.5rem;
-    }
-    
-    /* Glassmorphism Cards */
-    .metric-card {
-        background: rgba(15, 23, 42, 0.8);
-        backdrop-filter: blur(10px);
-        padding: 2rem;
-        border-radius: 20px;
-        border: 1px solid rgba(96, 165, 250, 0.2);
-        text-align: center;
-        margin: 1.5rem 0;
-        box-shadow: 0 8px 32px rgba(0,0,0,0.3);
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .metric-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 3px;
-        background: linear-gradient(90deg, #60a5fa, #a78bfa, #f472b6);
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-10px) scale(1.02);
-        box-shadow: 0 20px 50px rgba(96, 165, 250, 0.3);
-        border-color: rgba(96, 165, 250, 0.5);
-    }
-    
-    .metric-card h3 {
-        color: #94a3b8;
-        font-size: 1.1rem;
-        font-weight: 600;
-        margin-bottom: 1rem;
-    }
-    
-    .metric-card h2 {
-        color: #f1f5f9;
-        font-size: 3rem;
-        font-weight: 800;
-        margin: 0.5rem 0;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-    }
-    
-    .metric-card p {
-        color: #cbd5e1;
-        font-size: 0.9rem;
-        font-weight: 500;
-    }
-    
-    /* Prediction Cards with Neon Effect */
-    .prediction-card {
-        background: rgba(15, 23, 42, 0.9);
-        backdrop-filter: blur(15px);
-        padding: 2rem;
-        border-radius: 20px;
-        border: 1px solid rgba(167, 139, 250, 0.3);
-        margin: 1.5rem 0;
-        box-shadow: 0 15px 35px rgba(0,0,0,0.4);
-        transition: all 0.3s ease;
-        position: relative;
-    }
-    
-    .prediction-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        bottom: 0;
-        width: 4px;
-        background: linear-gradient(180deg, #10b981, #06d6a0, #118ab2);
-        border-radius: 0 0 0 20px;
-    }
-    
-    .prediction-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 25px 50px rgba(167, 139, 250, 0.2);
-    }
-    
-    .prediction-card h3 {
-        color: #a78bfa;
-        font-weight: 700;
-        font-size: 1.4rem;
-        margin-bottom: 1rem;
-    }
-    
-    .prediction-card h2 {
-        color: #f1f5f9;
-        font-weight: 800;
-        font-size: 2.5rem;
-        margin: 1rem 0;
-        text-shadow: 0 2px 8px rgba(0,0,0,0.5);
-    }
-    
-    .prediction-card p {
-        color: #cbd5e1;
-        font-weight: 600;
-        font-size: 1.1rem;
-        margin: 0.5rem 0;
-    }
-    
-    /* Form Sections with Dark Glass Effect */
-    .form-section {
-        background: rgba(30, 41, 59, 0.8);
-        backdrop-filter: blur(12px);
-        padding: 2rem;
-        border-radius: 16px;
-        border: 1px solid rgba(148, 163, 184, 0.2);
-        margin: 1.5rem 0;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.4);
-        transition: all 0.3s ease;
-    }
-    
-    .form-section:hover {
-        border-color: rgba(96, 165, 250, 0.4);
-        box-shadow: 0 15px 40px rgba(0,0,0,0.5);
-    }
-    
-    .form-section h4 {
-        color: #60a5fa;
-        font-weight: 700;
-        font-size: 1.3rem;
-        margin-bottom: 1rem;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-    }
-    
-    /* Dark Theme Form Controls */
-    .stSelectbox > div > div {
-        background: rgba(30, 41, 59, 0.8) !important;
-        border: 2px solid rgba(96, 165, 250, 0.3) !important;
-        border-radius: 12px !important;
-        backdrop-filter: blur(10px) !important;
-        color: #f1f5f9 !important;
-    }
-    
-    .stSelectbox > div > div:focus-within {
-        border-color: #60a5fa !important;
-        box-shadow: 0 0 0 3px rgba(96, 165, 250, 0.2) !important;
-    }
-    
-    .stNumberInput > div > div > input {
-        background: rgba(30, 41, 59, 0.8) !important;
-        border: 2px solid rgba(96, 165, 250, 0.3) !important;
-        border-radius: 12px !important;
-        color: #f1f5f9 !important;
-        backdrop-filter: blur(10px) !important;
-    }
-    
-    .stNumberInput > div > div > input:focus {
-        border-color: #60a5fa !important;
-        box-shadow: 0 0 0 3px rgba(96, 165, 250, 0.2) !important;
-    }
-    
-    /* Slider Dark Theme */
-    .stSlider > div > div > div {
-        background: rgba(30, 41, 59, 0.6) !important;
-        border-radius: 10px !important;
-    }
-    
-    .stSlider > div > div > div > div {
-        background: linear-gradient(90deg, #60a5fa, #a78bfa) !important;
-    }
-    
-    .stSlider > div > div > div[role="slider"] {
-        background: #f1f5f9 !important;
-        border: 3px solid #60a5fa !important;
-        box-shadow: 0 4px 15px rgba(96, 165, 250, 0.4) !important;
-    }
-    
-    /* Form Labels */
-    .stSelectbox label, .stNumberInput label, .stSlider label {
-        color: #cbd5e1 !important;
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-    }
-    
-    /* Button with Neon Effect */
-    .stButton button {
-        background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 50%, #ec4899 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 15px !important;
-        padding: 1rem 2rem !important;
-        font-weight: 700 !important;
-        font-size: 1.1rem !important;
-        box-shadow: 0 10px 25px rgba(59, 130, 246, 0.3) !important;
-        transition: all 0.3s ease !important;
-        text-transform: uppercase !important;
-        letter-spacing: 1px !important;
-    }
-    
-    .stButton button:hover {
-        transform: translateY(-3px) scale(1.05) !important;
-        box-shadow: 0 15px 35px rgba(59, 130, 246, 0.5) !important;
-    }
-    
-    /* Sidebar Dark Theme */
-    .stSidebar {
-        background: rgba(15, 23, 42, 0.95) !important;
-        backdrop-filter: blur(20px) !important;
-        border-right: 1px solid rgba(96, 165, 250, 0.2) !important;
-    }
-    
-    .stSidebar .stSelectbox > div > div {
-        background: rgba(30, 41, 59, 0.8) !important;
-        border: 1px solid rgba(96, 165, 250, 0.3) !important;
-        color: #f1f5f9 !important;
-    }
-    
-    .stSidebar h1, .stSidebar h2, .stSidebar h3 {
-        color: #60a5fa !important;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.3) !important;
-    }
-    
-    .stSidebar .stMarkdown {
-        color: #cbd5e1 !important;
-    }
-    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Custom Scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: rgba(30, 41, 59, 0.3);
-        border-radius: 10px;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(135deg, #60a5fa, #a78bfa);
-        border-radius: 10px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: linear-gradient(135deg, #3b82f6, #8b5cf6);
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_css():
+    """Read and minify the stylesheet once per server process"""
+    import re
+    with open(os.path.join(APP_DIR, 'assets', 'style.css'), 'r') as f:
+        css = f.read()
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css).strip()
+    return f"<style>{css}</style>"
 
-# Initialize session state
-if 'models_loaded' not in st.session_state:
-    st.session_state.models_loaded = False
-    st.session_state.components = None
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # Load models function
 @st.cache_resource
 def initialize_models():
-    """Load models and cache them"""
+    """Create the model registry and cache it (artifacts load on first use and hot-reload on change)"""
     try:
-        components = load_all_models()
-        if components is not None:
-            return components, True
-        else:
-            return None, False
+        from model_registry import ModelRegistry
+        registry = ModelRegistry(lazy=True).start()
+        return registry, True
     except Exception as e:
         st.error(f"Error loading models: {str(e)}")
         return None, False
@@ -365,18 +62,6 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Load models
-    if not st.session_state.models_loaded:
-        with st.spinner("Loading AI models..."):
-            components, success = initialize_models()
-            if success:
-                st.session_state.components = components
-                st.session_state.models_loaded = True
-                st.success("✅ Models loaded successfully!")
-            else:
-                st.error("❌ Failed to load models.")
-                st.stop()
-    
     # Epic Dark Sidebar
     with st.sidebar:
         st.markdown("""
@@ -419,6 +104,19 @@ def main():
         analytics_page()
     elif page == "ℹ️ About":
         about_page()
+    
+    # Create the registry once the page is drawn; it preloads the models on its
+    # own background thread, so the first prediction is fast
+    initialize_models()
+
+def get_components():
+    """Components of the latest validated model version; runs already in progress keep theirs"""
+    with st.spinner("Loading AI models..."):
+        registry, success = initialize_models()
+    if not success:
+        st.error("❌ Failed to load models.")
+        st.stop()
+    return registry.current()
 
 def home_page():
     """Home page with overview"""
@@ -513,9 +211,12 @@ def single_prediction_page():
         }
         
         # Make prediction
+        components = get_components()
+        from prediction_cache import cached_predict_single_student
+        
         with st.spinner("Analyzing student data..."):
             try:
-                results = predict_single_student(student_data, st.session_state.components)
+                results = cached_predict_single_student(student_data, components, use_linear_engine=True, svm_mode='single_pass')
                 
                 # Display results
                 st.markdown("---")
@@ -551,13 +252,18 @@ def single_prediction_page():
 
 def batch_prediction_page():
     """Batch prediction page"""
+    import pandas as pd
+    from prediction_functions import format_batch_results, predict_batch_students
+    from io import BytesIO
+    from student_io import read_file_columns, read_student_file, write_results
+    
     st.markdown('<h2 class="sub-header">📊 Batch Prediction</h2>', unsafe_allow_html=True)
     
     # Instructions and template
     st.markdown("""
     <div class="form-section">
         <h4>📋 Instructions</h4>
-        <p>Upload a CSV file with student data. Make sure your CSV contains all required columns with exact names and valid values.</p>
+        <p>Upload a CSV, Parquet or Arrow (Feather) file with student data. Make sure it contains all required columns with exact names and valid values.</p>
     </div>
     """, unsafe_allow_html=True)
     
@@ -566,7 +272,7 @@ def batch_prediction_page():
     
     with col1:
         st.markdown("### 📥 Upload Your Data")
-        uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
+        uploaded_file = st.file_uploader("Choose a CSV, Parquet or Arrow file", type=["csv", "parquet", "arrow", "feather"])
     
     with col2:
         st.markdown("### 📄 Download Sample Template")
@@ -599,41 +305,52 @@ def batch_prediction_page():
     
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
-            
-            st.markdown("### 📊 Data Preview")
-            st.dataframe(df.head())
-            
-            # Validate data
-            is_valid, missing_cols, extra_cols = validate_input_data(df)
+            # Validate the header before reading the body
+            feature_info = get_components()['feature_info']
+            feature_columns = feature_info['feature_columns']
+            columns = read_file_columns(uploaded_file)
+            missing_cols = [col for col in feature_columns if col not in columns]
+            extra_cols = [col for col in columns if col not in feature_columns]
             
-            if not is_valid:
+            if missing_cols:
                 st.error(f"❌ Missing required columns: {', '.join(missing_cols)}")
                 st.info("Please ensure your CSV has all required columns. Download the sample template above.")
             else:
+                # Extra columns (e.g. a student ID) are carried through to the results
+                df = read_student_file(uploaded_file, feature_info, keep_columns=extra_cols)
+                df = df[[col for col in columns if col in df.columns]]
+                
+                st.markdown("### 📊 Data Preview")
+                st.dataframe(df.head())
+                
                 if extra_cols:
-                    st.warning(f"⚠️ Extra columns found (will be ignored): {', '.join(extra_cols)}")
+                    st.info(f"ℹ️ Extra columns kept in the results: {', '.join(extra_cols)}")
                 
                 st.success("✅ Data format looks good!")
                 
+                output_format = st.selectbox("📦 Results file format", ["CSV", "Parquet", "Arrow"])
+                
                 if st.button("🚀 Run Batch Predictions", type="primary"):
                     with st.spinner("🤖 Processing batch predictions..."):
                         try:
-                            results = predict_batch_students(df, st.session_state.components)
+                            results = predict_batch_students(df, get_components(), svm_mode='single_pass')
                             
                             st.success("🎉 Batch predictions completed!")
                             
                             # Display results
                             st.markdown("### 📈 Prediction Results")
-                            st.dataframe(results)
+                            formatted_results = format_batch_results(results)
+                            st.dataframe(formatted_results)
                             
-                            # Download results
-                            results_csv = results.to_csv(index=False)
+                            # Download results; columnar formats keep the numeric confidences
+                            file_format = output_format.lower()
+                            results_file = BytesIO()
+                            write_results(formatted_results if file_format == 'csv' else results, results_file, file_format)
                             st.download_button(
-                                label="📥 Download Results as CSV",
-                                data=results_csv,
-                                file_name="prediction_results.csv",
-                                mime="text/csv"
+                                label=f"📥 Download Results as {output_format}",
+                                data=results_file.getvalue(),
+                                file_name=f"prediction_results.{file_format}",
+                                mime="text/csv" if file_format == 'csv' else "application/octet-stream"
                             )
                             
                             # Summary statistics
@@ -674,8 +391,8 @@ def batch_prediction_page():
                             st.info("💡 Please check your data format and try again. Make sure categorical values match the expected format.")
                             
         except Exception as e:
-            st.error(f"❌ Error reading CSV file: {str(e)}")
-            st.info("Please make sure your file is a valid CSV format.")
+            st.error(f"❌ Error reading file: {str(e)}")
+            st.info("Please make sure your file is a valid CSV, Parquet or Arrow file.")
 
 def analytics_page():
     """Analytics and insights page"""
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model_and_others'))
+
+from prediction_functions import LazyComponents, preprocess_input_data
+from synthetic_students import generate_students
+
+@pytest.fixture(scope='session')
+def components():
+    """
+    The shipped model artifacts, fully loaded
+    """
+    return LazyComponents().to_dict()
+
+@pytest.fixture(scope='session')
+def students():
+    """
+    Seeded synthetic students with the 14 feature columns
+    """
+    return generate_students(500, random_state=7, decimals=1)
+
+@pytest.fixture(scope='session')
+def encoded_students(components, students):
+    """
+    The synthetic students label-encoded but not scaled
+    """
+    df = preprocess_input_data(students, components['feature_encoders'], components['feature_info'],
+                               components.get('encoding_tables'))
+    return df[components['feature_info']['feature_columns']].astype('float64')
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from model_registry import SMOKE_TEST_STUDENT
+from prediction_functions import encode_features, predict_single_student, score_with_contributions
+
+def test_engine_matches_dataframe_path(components):
+    engine = predict_single_student(SMOKE_TEST_STUDENT, components, use_linear_engine=True, svm_mode='single_pass')
+    sklearn = predict_single_student(SMOKE_TEST_STUDENT, components)
+
+    for key in ('primary_prediction', 'secondary_prediction'):
+        assert engine[key]['prediction'] == sklearn[key]['prediction']
+        assert engine[key]['confidence'] == pytest.approx(sklearn[key]['confidence'], abs=1e-9)
+
+@pytest.mark.parametrize('value', [None, float('nan'), float('inf')])
+def test_missing_numeric_value_raises(components, value):
+    student = dict(SMOKE_TEST_STUDENT, age=value)
+
+    with pytest.raises(ValueError, match='age'):
+        predict_single_student(student, components, use_linear_engine=True, svm_mode='single_pass')
+    with pytest.raises(ValueError, match='age'):
+        score_with_contributions(student, components['contribution_tables'])
+
+def test_missing_value_in_array_raises(components):
+    columns = components['feature_info']['feature_columns']
+    rows = np.array([[SMOKE_TEST_STUDENT[col] for col in columns]] * 3, dtype=object)
+    rows[1, columns.index('sleep_hours')] = np.nan
+
+    with pytest.raises(ValueError, match='sleep_hours'):
+        encode_features(rows, components)
@@ -0,0 +1,29 @@
+import os
+import shutil
+
+import joblib
+
+from prediction_functions import MODEL_ARTIFACT_FILES, LazyComponents
+
+def test_iteration_matches_getitem(components):
+    lazy = LazyComponents()
+
+    assert set(dict(lazy)) == set(components)
+    assert len(lazy) == len(components)
+
+def test_skips_svm_engine_without_probabilities(tmp_path):
+    source = LazyComponents().model_dir
+    for filename in MODEL_ARTIFACT_FILES:
+        shutil.copy(os.path.join(source, filename), tmp_path / filename)
+    svm_model = joblib.load(tmp_path / 'svm_model.pkl')
+    svm_model.probability = False
+    joblib.dump(svm_model, tmp_path / 'svm_model.pkl')
+
+    lazy = LazyComponents(str(tmp_path))
+    names = list(lazy)
+
+    assert 'svm_engine' not in names
+    assert not lazy.is_loaded('linear_engine')
+    loaded = dict(lazy.items())
+    assert set(loaded) == set(names) and len(lazy) == len(names)
+    assert 'svm_engine' not in lazy
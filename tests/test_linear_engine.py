@@ -0,0 +1,46 @@
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from prediction_functions import (compile_linear_engine, linear_engine_predict_proba, score_with_contributions,
+                                  verify_linear_engine)
+
+def test_matches_sklearn_on_shipped_models(components, encoded_students):
+    expected = components['lr_model'].predict_proba(components['scaler'].transform(encoded_students))
+    actual = linear_engine_predict_proba(components['linear_engine'], encoded_students.to_numpy())
+
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
+    np.testing.assert_array_equal(actual.argmax(axis=1), expected.argmax(axis=1))
+
+def test_verify_linear_engine_on_sample_template(components):
+    is_equivalent, max_diff = verify_linear_engine(components)
+    assert is_equivalent, max_diff
+
+def test_contribution_tables_match_sklearn(components, students, encoded_students):
+    tables = components['contribution_tables']
+    X = components['scaler'].transform(encoded_students)
+    expected_proba = components['lr_model'].predict_proba(X)
+    expected_logits = components['lr_model'].decision_function(X)
+
+    for i, student in enumerate(students.head(100).to_dict('records')):
+        result = score_with_contributions(student, tables, with_contributions=True)
+
+        np.testing.assert_allclose([result['probabilities'][c] for c in tables['classes']], expected_proba[i],
+                                   rtol=0, atol=1e-9)
+        # Per-feature contributions plus the intercept add up to each class logit
+        logits = np.array(tables['intercept'])
+        for contribution in result['contributions'].values():
+            logits += [contribution[c] for c in tables['classes']]
+        np.testing.assert_allclose(logits, expected_logits[i], rtol=0, atol=1e-9)
+
+def test_binary_model():
+    rng = np.random.RandomState(0)
+    X = rng.normal(5.0, 3.0, (300, 4))
+    y = (X[:, 0] - X[:, 2] + rng.normal(0, 1, 300) > 0).astype(int)
+    scaler = StandardScaler().fit(X)
+    lr_model = LogisticRegression().fit(scaler.transform(X), y)
+
+    expected = lr_model.predict_proba(scaler.transform(X))
+    actual = linear_engine_predict_proba(compile_linear_engine(lr_model, scaler), X)
+
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from micro_batching import MicroBatcher
+from prediction_functions import predict_students
+
+@pytest.fixture
+def student_rows(students):
+    return students.head(8).to_dict('records')
+
+def score_concurrently(components, students):
+    async def run():
+        async with MicroBatcher(components, max_wait=0.05) as batcher:
+            results = await asyncio.gather(*(batcher.predict(student) for student in students),
+                                           return_exceptions=True)
+            return results, batcher.stats()
+    return asyncio.run(run())
+
+def test_each_caller_gets_its_own_result(components, student_rows):
+    results, stats = score_concurrently(components, student_rows)
+
+    # Scored as one batch, so the results match the batch call row for row
+    assert results == predict_students(student_rows, components)
+    assert stats['batches'] == 1 and stats['largest_batch'] == len(student_rows)
+
+def test_invalid_request_fails_only_its_own_future(components, student_rows):
+    student_rows[3] = {**student_rows[3], 'study_hours_per_day': float('nan')}
+
+    results, _ = score_concurrently(components, student_rows)
+
+    # The failed batch falls back to scoring each request on its own
+    assert isinstance(results[3], ValueError)
+    valid = student_rows[:3] + student_rows[4:]
+    assert results[:3] + results[4:] == [predict_students([student], components)[0] for student in valid]
@@ -0,0 +1,33 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from model_bundle import export_model_bundle, load_model_bundle
+from prediction_functions import compile_linear_engine, load_all_models, predict_batch_students
+
+def test_bundle_predictions_match_pickles(components, students, tmp_path):
+    bundle_path = export_model_bundle(components, str(tmp_path / 'model_bundle.bin'))
+
+    expected = predict_batch_students(students, load_all_models(), svm_mode='single_pass')
+    actual = predict_batch_students(students, load_all_models(bundle_path=bundle_path), svm_mode='single_pass')
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+def test_bundle_restores_lr_probabilities(components, encoded_students, tmp_path):
+    bundle = load_model_bundle(export_model_bundle(components, str(tmp_path / 'model_bundle.bin')))
+
+    X = components['scaler'].transform(encoded_students)
+    np.testing.assert_allclose(bundle['lr_model'].predict_proba(X), components['lr_model'].predict_proba(X),
+                               rtol=0, atol=1e-12)
+
+def test_bundle_keeps_one_vs_rest(components, tmp_path):
+    ovr_components = dict(components)
+    ovr_components['lr_model'] = copy.deepcopy(components['lr_model'])
+    ovr_components['lr_model'].multi_class = 'ovr'
+    ovr_components['linear_engine'] = compile_linear_engine(ovr_components['lr_model'], components['scaler'])
+
+    bundle = load_model_bundle(export_model_bundle(ovr_components, str(tmp_path / 'model_bundle.bin')))
+
+    assert bundle['lr_model'].multi_class == 'ovr'
+    assert not bundle['linear_engine']['multinomial']
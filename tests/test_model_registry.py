@@ -0,0 +1,31 @@
+import os
+import shutil
+
+import joblib
+import numpy as np
+import pytest
+
+from model_registry import ModelRegistry
+from prediction_functions import MODEL_ARTIFACT_FILES, LazyComponents, model_fingerprint
+
+@pytest.fixture
+def other_model_dir(tmp_path):
+    """
+    A copy of the shipped artifacts with different Logistic Regression weights
+    """
+    source = LazyComponents().model_dir
+    for filename in MODEL_ARTIFACT_FILES:
+        shutil.copy(os.path.join(source, filename), tmp_path / filename)
+
+    lr_model = joblib.load(tmp_path / 'logistic_regression_model.pkl')
+    lr_model.coef_ = lr_model.coef_ * 0.5
+    joblib.dump(lr_model, tmp_path / 'logistic_regression_model.pkl')
+    return tmp_path
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_serves_models_from_model_dir(components, other_model_dir, lazy):
+    registry = ModelRegistry(model_dir=str(other_model_dir), lazy=lazy)
+
+    served = registry.current()['lr_model'].coef_
+    np.testing.assert_allclose(served, components['lr_model'].coef_ * 0.5)
+    assert registry.version == model_fingerprint(str(other_model_dir))
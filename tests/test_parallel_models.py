@@ -0,0 +1,48 @@
+import os
+import signal
+import threading
+
+import pytest
+
+import prediction_functions
+from prediction_functions import predict_batch_parallel, run_models
+
+def test_parallel_models_returns_both_results():
+    assert run_models(lambda: 'lr', lambda: 'svm', parallel_models=True) == ('lr', 'svm')
+
+def test_predict_batch_parallel_rejects_empty_input(students):
+    with pytest.raises(ValueError, match="No students to score"):
+        predict_batch_parallel(students.iloc[:0])
+
+def test_one_pool_when_threads_race():
+    prediction_functions._reset_model_pool()
+    barrier = threading.Barrier(8)
+    pools = []
+
+    def first_use():
+        barrier.wait()
+        pools.append(prediction_functions._get_model_pool())
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(pool) for pool in pools}) == 1
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs os.fork")
+def test_parallel_models_after_fork():
+    # The parent's pool threads don't exist in a forked child
+    run_models(lambda: 'lr', lambda: 'svm', parallel_models=True)
+
+    pid = os.fork()
+    if pid == 0:
+        signal.alarm(20)
+        ok = False
+        try:
+            ok = run_models(lambda: 'lr', lambda: 'svm', parallel_models=True) == ('lr', 'svm')
+        finally:
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
@@ -0,0 +1,50 @@
+import copy
+
+import pytest
+
+from prediction_cache import PredictionCache
+
+@pytest.fixture
+def student_rows(students):
+    return students.head(3).to_dict('records')
+
+def test_hit_on_repeated_input(components, student_rows):
+    cache = PredictionCache()
+    first = cache.predict(student_rows[0], components)
+    # 20 and 20.0 share an entry
+    second = cache.predict({**student_rows[0], 'age': float(student_rows[0]['age'])}, components)
+
+    assert second == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_lru_eviction_at_maxsize(components, student_rows):
+    cache = PredictionCache(maxsize=2)
+    cache.predict(student_rows[0], components)
+    cache.predict(student_rows[1], components)
+    cache.predict(student_rows[0], components)
+    cache.predict(student_rows[2], components)
+
+    # student 1 was least recently used
+    assert cache.evictions == 1
+    cache.predict(student_rows[0], components)
+    cache.predict(student_rows[1], components)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+def test_miss_after_fingerprint_change(components, student_rows):
+    cache = PredictionCache()
+    cache.predict(student_rows[0], components)
+    cache.predict(student_rows[0], dict(components, model_fingerprint='retrained'))
+
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert cache.invalidations == 1
+    assert cache.stats()['model_fingerprint'] == 'retrained'
+
+def test_results_are_copies(components, student_rows):
+    cache = PredictionCache()
+    first = cache.predict(student_rows[0], components)
+    expected = copy.deepcopy(first)
+
+    first['primary_prediction']['prediction'] = 'changed'
+    cache.predict(student_rows[0], components)['primary_prediction']['probabilities'].clear()
+
+    assert cache.predict(student_rows[0], components) == expected
@@ -0,0 +1,60 @@
+import numpy as np
+from sklearn.svm import SVC
+
+from prediction_functions import SVM_HOLDOUT_ROWS, build_svm_approximation
+from svm_engine import compile_svm_engine, fit_svm_approximation, svm_engine_predict
+
+def scaled(components, encoded_students):
+    return components['scaler'].transform(encoded_students)
+
+def test_matches_sklearn_on_shipped_models(components, encoded_students):
+    X = scaled(components, encoded_students)
+    svm_model = components['svm_model']
+
+    labels, proba = svm_engine_predict(components['svm_engine'], X)
+
+    np.testing.assert_array_equal(labels, svm_model.predict(X))
+    np.testing.assert_allclose(proba, svm_model.predict_proba(X), rtol=0, atol=1e-9)
+
+def test_proba_label_policy_is_argmax(components, encoded_students):
+    X = scaled(components, encoded_students)
+
+    labels, proba = svm_engine_predict(components['svm_engine'], X, label_policy='proba')
+
+    np.testing.assert_array_equal(labels, components['svm_engine']['classes'][proba.argmax(axis=1)])
+
+def test_blocking_and_float32(components, encoded_students):
+    X = scaled(components, encoded_students)
+    engine = components['svm_engine']
+    labels, proba = svm_engine_predict(engine, X)
+
+    block_labels, block_proba = svm_engine_predict(engine, X, block_size=37)
+    np.testing.assert_array_equal(block_labels, labels)
+    np.testing.assert_allclose(block_proba, proba, rtol=0, atol=1e-12)
+
+    _, float32_proba = svm_engine_predict(engine, X, float32=True)
+    np.testing.assert_allclose(float32_proba, proba, rtol=0, atol=1e-4)
+
+def test_binary_model():
+    rng = np.random.RandomState(0)
+    X = rng.normal(0.0, 1.0, (200, 4))
+    y = (X[:, 0] * X[:, 1] + rng.normal(0, 0.3, 200) > 0).astype(int)
+    svm_model = SVC(kernel='rbf', probability=True, random_state=0).fit(X, y)
+
+    labels, proba = svm_engine_predict(compile_svm_engine(svm_model), X)
+
+    np.testing.assert_array_equal(labels, svm_model.predict(X))
+    np.testing.assert_allclose(proba, svm_model.predict_proba(X), rtol=0, atol=1e-9)
+
+def test_approximation_fidelity_is_measured_on_students(components, encoded_students):
+    X = scaled(components, encoded_students)
+
+    approx = fit_svm_approximation(components['svm_engine'], X, n_components=32)
+    exact_labels, _ = svm_engine_predict(components['svm_engine'], X)
+    approx_labels, _ = svm_engine_predict(approx, X)
+
+    assert approx['fidelity']['holdout_rows'] == len(X)
+    assert approx['fidelity']['label_agreement'] == np.mean(exact_labels == approx_labels)
+
+    default = build_svm_approximation(dict(components))
+    assert default['fidelity']['holdout_rows'] == SVM_HOLDOUT_ROWS
@@ -0,0 +1,321 @@
+"""
+Train the models with a parallel hyperparameter search
+
+Usage:
+    python train_models.py [--n-samples 200] [--jobs -1]
+    python train_models.py --data students.parquet --cv 5 --factor 3
+
+Logistic Regression is searched over C and class_weight, the RBF SVM over
+C, gamma and class_weight, each with successive halving (HalvingGridSearchCV):
+every candidate is first cross-validated on a small sample of the training
+split, and only the best 1/--factor of them go on to the next round with
+--factor times as many rows. Candidates and folds run in parallel through
+joblib on --jobs cores (all of them by default).
+
+Each candidate is a scaler + model pipeline, so every validation fold is
+scaled with statistics from its own training folds only. The SVM is searched
+without Platt scaling, which would add an internal 5-fold fit per candidate;
+only the winner is refit with probabilities. The winners are refit on the
+whole training split and their scaler and model saved as the same pickles
+fix_models.py writes, with their test accuracy and the search results in
+model_metadata.json, and the model bundle is exported again.
+
+Training data is either a CSV, Parquet or Arrow file with the 14 features
+and exam_score or performance_category, or --n-samples synthetic students.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.svm import SVC
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_and_others'))
+from model_bundle import DEFAULT_BUNDLE_FILE, export_model_bundle
+from prediction_functions import LazyComponents, verify_linear_engine
+from student_io import detect_format
+from synthetic_students import PERFORMANCE_BINS, PERFORMANCE_LABELS, generate_students, load_feature_ranges
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_and_others')
+
+LR_PARAM_GRID = {
+    'C': [0.001, 0.01, 0.1, 1, 10, 100, 1000],
+    'class_weight': [None, 'balanced']
+}
+
+SVM_PARAM_GRID = {
+    'C': [0.1, 1, 10, 100, 1000],
+    'gamma': ['scale', 0.001, 0.01, 0.1, 1],
+    'class_weight': [None, 'balanced']
+}
+
+# Candidates kept per model in model_metadata.json
+TOP_CANDIDATES = 10
+
+def load_training_data(path=None, file_format=None, n_samples=200, random_state=42):
+    """
+    Training students from a file, or synthetic ones when path is None
+
+    Returns:
+        DataFrame with the feature columns and performance_category
+
+    Raises:
+        ValueError: If the file lacks feature columns or a target
+    """
+    if path is None:
+        return generate_students(n_samples, random_state=random_state, with_target=True)
+
+    file_format = detect_format(path, file_format)
+    if file_format == 'csv':
+        df = pd.read_csv(path)
+    elif file_format == 'parquet':
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_feather(path)
+
+    missing_columns = [col for col in load_feature_ranges() if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+    if 'performance_category' not in df.columns:
+        if 'exam_score' not in df.columns:
+            raise ValueError("Training data needs an exam_score or performance_category column")
+        df['performance_category'] = pd.cut(df['exam_score'], bins=PERFORMANCE_BINS,
+                                            labels=PERFORMANCE_LABELS, include_lowest=True)
+    return df
+
+def encode_training_data(df):
+    """
+    Label-encode the categorical features and the target, as fix_models.py does
+
+    Returns:
+        Tuple (X, y, feature_encoders, target_encoder, feature_info)
+    """
+    feature_ranges = load_feature_ranges()
+    feature_columns = list(feature_ranges)
+    categorical_columns = [col for col, spec in feature_ranges.items() if spec['type'] == 'choice']
+    numerical_columns = [col for col in feature_columns if col not in categorical_columns]
+
+    df = df.dropna(subset=feature_columns + ['performance_category'])
+    X = df[feature_columns].copy()
+    feature_encoders = {}
+    for col in categorical_columns:
+        le = LabelEncoder()
+        X[col] = le.fit_transform(X[col].astype(str))
+        feature_encoders[col] = le
+    X[numerical_columns] = X[numerical_columns].astype(np.float64)
+
+    target_encoder = LabelEncoder()
+    y = target_encoder.fit_transform(df['performance_category'].astype(str))
+
+    feature_info = {
+        'feature_columns': feature_columns,
+        'categorical_columns': categorical_columns,
+        'numerical_columns': numerical_columns
+    }
+    return X, y, feature_encoders, target_encoder, feature_info
+
+def model_pipeline(estimator):
+    """
+    StandardScaler followed by the estimator, fit together on each training split
+    """
+    return Pipeline([('scaler', StandardScaler()), ('model', estimator)])
+
+def search_model(estimator, param_grid, X, y, cv=5, factor=3, n_jobs=-1, scoring='accuracy', random_state=42):
+    """
+    Successive-halving grid search, parallel over candidates and folds
+
+    The estimator is searched inside model_pipeline, so the scaler never
+    sees the validation fold it is scored on.
+
+    Args:
+        estimator: Unfitted model
+        param_grid: Grid over the model's own parameter names
+        X: Unscaled training features
+
+    Returns:
+        Tuple (fitted HalvingGridSearchCV, search summary for model_metadata.json
+        with the parameters under the model's own names)
+    """
+    search = HalvingGridSearchCV(
+        model_pipeline(estimator),
+        {f'model__{name}': values for name, values in param_grid.items()},
+        factor=factor,
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state),
+        scoring=scoring,
+        refit=False,
+        n_jobs=n_jobs,
+        random_state=random_state
+    )
+    start = time.perf_counter()
+    search.fit(X, y)
+    elapsed = time.perf_counter() - start
+
+    def model_params(params):
+        return {name[len('model__'):]: value for name, value in params.items()}
+
+    results = search.cv_results_
+    ranked = np.argsort(results['rank_test_score'], kind='stable')[:TOP_CANDIDATES]
+    summary = {
+        'method': 'HalvingGridSearchCV',
+        'scoring': scoring,
+        'cv_folds': cv,
+        'factor': factor,
+        'n_candidates': int(search.n_candidates_[0]),
+        'n_iterations': int(search.n_iterations_),
+        'candidates_per_iteration': [int(n) for n in search.n_candidates_],
+        'samples_per_iteration': [int(n) for n in search.n_resources_],
+        'search_seconds': round(elapsed, 2),
+        'best_params': model_params(search.best_params_),
+        'best_cv_score': float(search.best_score_),
+        'top_candidates': [
+            {
+                'params': model_params(results['params'][i]),
+                'mean_cv_score': float(results['mean_test_score'][i]),
+                'std_cv_score': float(results['std_test_score'][i]),
+                'iteration': int(results['iter'][i]),
+                'samples': int(results['n_resources'][i])
+            }
+            for i in ranked
+        ]
+    }
+    return search, summary
+
+def build_metadata(df, feature_info, target_encoder, lr_accuracy, svm_accuracy, lr_search, svm_search):
+    """
+    model_metadata.json contents: fix_models.py's layout plus the search results
+    """
+    categories = df['performance_category'].astype(str)
+    return {
+        'project_info': {
+            'name': 'Academic Performance Prediction System',
+            'description': 'Predicts student academic performance using study habits and personal factors',
+            'version': '1.0',
+            'created_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'dataset_size': f"{len(df)} students, {len(feature_info['feature_columns']) + 2} features"
+        },
+        'target_variable': {
+            'original_column': 'exam_score',
+            'categories': list(target_encoder.classes_),
+            'distribution': {label: int((categories == label).sum()) for label in PERFORMANCE_LABELS}
+        },
+        'features': {
+            'total_features': len(feature_info['feature_columns']),
+            'feature_list': feature_info['feature_columns'],
+            'categorical_features': feature_info['categorical_columns'],
+            'numerical_features': feature_info['numerical_columns'],
+            'top_important_features': [
+                {'feature': 'social_media_hours', 'importance': 0.178, 'impact': 'negative'},
+                {'feature': 'study_hours_per_day', 'importance': 0.153, 'impact': 'positive'},
+                {'feature': 'diet_quality', 'importance': 0.134, 'impact': 'positive'},
+                {'feature': 'mental_health_rating', 'importance': 0.085, 'impact': 'positive'},
+                {'feature': 'extracurricular_participation', 'importance': 0.057, 'impact': 'positive'}
+            ]
+        },
+        'model_performance': {
+            'primary_model': {
+                'name': 'Logistic Regression',
+                'accuracy': float(lr_accuracy),
+                'accuracy_percentage': f"{lr_accuracy:.1%}",
+                'params': lr_search['best_params'],
+                'recommended': True
+            },
+            'secondary_model': {
+                'name': 'Support Vector Machine',
+                'accuracy': float(svm_accuracy),
+                'accuracy_percentage': f"{svm_accuracy:.1%}",
+                'params': svm_search['best_params'],
+                'recommended': False
+            }
+        },
+        'hyperparameter_search': {
+            'logistic_regression': lr_search,
+            'svm': svm_search
+        }
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the models with a parallel hyperparameter search")
+    parser.add_argument('--data', help="CSV, Parquet or Arrow training file (defaults to synthetic students)")
+    parser.add_argument('--data-format', choices=['csv', 'parquet', 'arrow'],
+                        help="Training file format (defaults to the file extension)")
+    parser.add_argument('--n-samples', type=int, default=200, help="Synthetic students to train on without --data")
+    parser.add_argument('--jobs', type=int, default=-1, help="Parallel joblib workers (-1 uses all cores)")
+    parser.add_argument('--cv', type=int, default=5, help="Cross-validation folds")
+    parser.add_argument('--factor', type=int, default=3, help="Successive halving factor")
+    parser.add_argument('--scoring', default='accuracy', help="sklearn scoring used to rank candidates")
+    parser.add_argument('--output-dir', default=MODEL_DIR, help="Directory the models are written to")
+    args = parser.parse_args()
+
+    try:
+        df = load_training_data(args.data, args.data_format, args.n_samples)
+        X, y, feature_encoders, target_encoder, feature_info = encode_training_data(df)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"📊 {len(X)} students, classes {list(target_encoder.classes_)}")
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    search_options = dict(cv=args.cv, factor=args.factor, n_jobs=args.jobs, scoring=args.scoring)
+
+    print("🚀 Searching Logistic Regression...")
+    _, lr_search = search_model(LogisticRegression(random_state=42, max_iter=1000), LR_PARAM_GRID,
+                                X_train, y_train, **search_options)
+    print(f"  best {lr_search['best_params']} (cv {lr_search['best_cv_score']:.3f}, {lr_search['search_seconds']:.1f}s)")
+
+    print("🚀 Searching SVM...")
+    _, svm_search = search_model(SVC(kernel='rbf', random_state=42), SVM_PARAM_GRID,
+                                 X_train, y_train, **search_options)
+    print(f"  best {svm_search['best_params']} (cv {svm_search['best_cv_score']:.3f}, {svm_search['search_seconds']:.1f}s)")
+
+    lr_pipeline = model_pipeline(LogisticRegression(random_state=42, max_iter=1000, **lr_search['best_params']))
+    lr_pipeline.fit(X_train, y_train)
+    svm_pipeline = model_pipeline(SVC(kernel='rbf', random_state=42, probability=True, **svm_search['best_params']))
+    svm_pipeline.fit(X_train, y_train)
+
+    # Both scalers are fit on the full X_train, so either one matches both models
+    scaler = lr_pipeline.named_steps['scaler']
+    lr_model = lr_pipeline.named_steps['model']
+    svm_model = svm_pipeline.named_steps['model']
+
+    lr_accuracy = lr_pipeline.score(X_test, y_test)
+    svm_accuracy = svm_pipeline.score(X_test, y_test)
+    print(f"Logistic Regression Accuracy: {lr_accuracy:.3f}")
+    print(f"SVM Accuracy: {svm_accuracy:.3f}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    joblib.dump(lr_model, os.path.join(args.output_dir, 'logistic_regression_model.pkl'))
+    joblib.dump(svm_model, os.path.join(args.output_dir, 'svm_model.pkl'))
+    joblib.dump(scaler, os.path.join(args.output_dir, 'scaler.pkl'))
+    joblib.dump(target_encoder, os.path.join(args.output_dir, 'target_label_encoder.pkl'))
+    joblib.dump(feature_encoders, os.path.join(args.output_dir, 'feature_label_encoders.pkl'))
+    joblib.dump(feature_info, os.path.join(args.output_dir, 'feature_info.pkl'))
+
+    metadata = build_metadata(df, feature_info, target_encoder, lr_accuracy, svm_accuracy, lr_search, svm_search)
+    with open(os.path.join(args.output_dir, 'model_metadata.json'), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    print(f"✅ Models saved to {args.output_dir}")
+
+    components = LazyComponents(args.output_dir).to_dict()
+    sample = df[feature_info['feature_columns']].head(1000)
+    is_equivalent, max_diff = verify_linear_engine(components, sample)
+    if not is_equivalent:
+        print(f"❌ Linear engine equivalence test FAILED! (max diff {max_diff:.2e})")
+        return 1
+    print(f"✅ Linear engine equivalence test PASSED! (max diff {max_diff:.2e})")
+
+    bundle_path = export_model_bundle(components, os.path.join(args.output_dir, DEFAULT_BUNDLE_FILE))
+    print(f"✅ Model bundle exported to {bundle_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())